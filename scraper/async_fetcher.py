@@ -0,0 +1,222 @@
+"""Backend fetch asyncio untuk crawler (opsional, membutuhkan aiohttp)"""
+import asyncio
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from crawl_engine import CrawlEngine, FetchResult
+from http_client import ConnectionStats, ResponseSkipped, aiohttp_trace_config, check_response_headers, decode_body
+
+
+# Jeda setelah 403 jika engine dipakai tanpa HostScheduler: dua kali jeda default crawler (2-5 detik)
+FALLBACK_BACKOFF = (4.0, 10.0)
+
+
+def is_available():
+    """True jika aiohttp terinstal dan mode async bisa dipakai"""
+    return aiohttp is not None
+
+
+class AsyncCrawlEngine(CrawlEngine):
+    """Crawl breadth-first dengan banyak request bersamaan dalam satu event loop
+
+    Berbeda dengan CrawlEngine, handler di sini hanya memproses halaman:
+    handler(url, fetch_result, depth) dijalankan di thread executor dan
+    mengembalikan daftar link. Fetch (timeout, retry, backoff 403) dilakukan dengan aiohttp.
+    """
+
+    def __init__(self, handler, max_depth, follow_links=True, is_active=None, max_pages=None,
+                 num_workers=50, scheduler=None, on_error=None, report=None,
+                 headers_factory=None, timeout=30, max_retries=3, parse_workers=2,
+                 pool_maxsize=10, stats=None, http_cache=None, seen=None, url_filter=None,
+                 max_body_size=None, on_fetch_failed=None):
+        super().__init__(handler, max_depth, follow_links=follow_links, is_active=is_active,
+                         max_pages=max_pages, num_workers=num_workers, scheduler=scheduler,
+                         on_error=on_error, seen=seen, url_filter=url_filter)
+        self.report = report or (lambda kind, msg: None)
+        self.headers_factory = headers_factory or dict
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.parse_workers = parse_workers
+        self.pool_maxsize = pool_maxsize
+        self.stats = stats or ConnectionStats()
+        self.http_cache = http_cache
+        self.max_body_size = max_body_size
+        self.on_fetch_failed = on_fetch_failed
+
+    def run(self, start_url):
+        if aiohttp is None:
+            raise RuntimeError("Mode async membutuhkan paket aiohttp")
+
+        self.frontier.add(start_url, 0)
+        asyncio.run(self._run())
+        return self.pages_crawled
+
+    async def _run(self):
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        # Koneksi keep-alive dipakai ulang per host, dibatasi pool_maxsize
+        connector = aiohttp.TCPConnector(limit=self.num_workers,
+                                         limit_per_host=self.pool_maxsize,
+                                         ssl=False)
+
+        # Worker yang menganggur menunggu event ini, bukan polling frontier;
+        # frontier bisa berubah dari thread executor (add_links) maupun event loop
+        loop = asyncio.get_running_loop()
+        self._frontier_changed = asyncio.Event()
+        self.frontier.on_change = lambda: loop.call_soon_threadsafe(self._frontier_changed.set)
+
+        # Parsing HTML tetap di thread terpisah supaya event loop tidak tersendat
+        with ThreadPoolExecutor(max_workers=self.parse_workers) as executor:
+            async with aiohttp.ClientSession(timeout=timeout, connector=connector,
+                                             trace_configs=[aiohttp_trace_config(self.stats)]) as session:
+                try:
+                    await asyncio.gather(*(
+                        self._async_worker(session, executor) for _ in range(self.num_workers)
+                    ))
+                finally:
+                    self.frontier.on_change = None
+
+    async def _sleep(self, seconds):
+        """Versi async dari sleep_while_active"""
+        loop_time = asyncio.get_running_loop().time
+        deadline = loop_time() + seconds
+        remaining = seconds
+        while remaining > 0:
+            if not self.is_active():
+                return False
+            await asyncio.sleep(min(remaining, 0.2))
+            remaining = deadline - loop_time()
+        return self.is_active()
+
+    async def _backoff(self, url):
+        """Versi async dari HostScheduler.backoff, return False jika crawl dihentikan"""
+        if not self.scheduler:
+            return await self._sleep(random.uniform(*FALLBACK_BACKOFF))
+        return (await self._sleep(self.scheduler.backoff_delay())
+                and await self._sleep(self.scheduler.reserve(url)))
+
+    async def _next_item(self):
+        """Ambil URL berikutnya dari frontier, return None jika crawl selesai atau dihentikan"""
+        while self.is_active():
+            # Event dikosongkan sebelum cek frontier; perubahan sesudahnya membangunkan lagi
+            self._frontier_changed.clear()
+            item, wait = self.frontier.pop_nowait()
+            if item is not None:
+                return item
+            if self.frontier.is_done():
+                return None
+            # Bangun saat frontier berubah, saat host berikutnya siap, atau untuk cek is_active()
+            try:
+                await asyncio.wait_for(self._frontier_changed.wait(), min(wait or 0.2, 0.2))
+            except asyncio.TimeoutError:
+                pass
+        return None
+
+    async def _begin_page_async(self):
+        """Versi async dari _begin_page, menunggu tanpa memblokir event loop"""
+        while True:
+            with self._gate:
+                if not self._paused:
+                    self._busy += 1
+                    return
+            await asyncio.sleep(0.05)
+
+    async def _fetch(self, session, executor, url):
+        """Ambil halaman dengan retry dan backoff 403, return FetchResult atau None jika gagal"""
+        headers = self.headers_factory()
+        # Request kondisional jika halaman sudah ada di cache; query SQLite di executor
+        entry = None
+        if self.http_cache:
+            entry = await asyncio.get_running_loop().run_in_executor(executor, self.http_cache.get, url)
+        if entry:
+            headers.update(entry.conditional_headers())
+
+        for attempt in range(self.max_retries):
+            last_attempt = attempt == self.max_retries - 1
+            try:
+                async with session.get(url, headers=headers) as response:
+                    # Cek jika diblokir
+                    if response.status == 403:
+                        self.report("error", f"Terdeteksi sebagai bot di {url}, mencoba lagi...\n")
+                        # Tunggu lebih lama, lalu antre lagi di slot host yang sama
+                        if not await self._backoff(url):
+                            return None
+                        continue
+
+                    if response.status == 304 and entry:
+                        self.http_cache.record_not_modified()
+                        return FetchResult(url, 304, None, entry.etag, entry.last_modified, entry)
+
+                    response.raise_for_status()
+                    text = await self._read_text(response)
+                    return FetchResult(url, response.status, text,
+                                       response.headers.get('ETag'),
+                                       response.headers.get('Last-Modified'),
+                                       entry)
+
+            except ResponseSkipped as e:
+                self.stats.record_skipped()
+                self.report("page", f"Dilewati {url}: {str(e)}\n")
+                return None
+            except aiohttp.ClientConnectionError:
+                if last_attempt:
+                    self.report("error", f"Koneksi gagal ke {url} setelah {self.max_retries} percobaan\n")
+            except Exception as e:
+                if last_attempt:
+                    self.report("error", f"Error pada {url}: {str(e) or type(e).__name__}\n")
+        return None
+
+    async def _read_text(self, response, chunk_size=65536):
+        """Versi async dari http_client.read_text: header dicek dulu, body dibatasi max_body_size"""
+        check_response_headers(response.headers, self.max_body_size)
+        chunks = []
+        size = 0
+        async for chunk in response.content.iter_chunked(chunk_size):
+            size += len(chunk)
+            if self.max_body_size and size > self.max_body_size:
+                raise ResponseSkipped(f"body melebihi batas {self.max_body_size} byte")
+            chunks.append(chunk)
+        return decode_body(b''.join(chunks), response.charset)
+
+    async def _async_worker(self, session, executor):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            item = await self._next_item()
+            if item is None:
+                break
+
+            url, depth = item
+            started = False
+            try:
+                # Slot host sudah dipesan oleh frontier.pop()
+                if not self._claim_page():
+                    break
+
+                await self._begin_page_async()
+                started = True
+                page = await self._fetch(session, executor, url)
+                links = None
+                if page is not None:
+                    links = await loop.run_in_executor(executor, self.handler, url, page, depth)
+                elif self.on_fetch_failed:
+                    self.on_fetch_failed(url)
+                self.pages_crawled += 1
+
+                if links and self.url_filter:
+                    # Filter URL bisa memblokir (fetch robots.txt), jadi tidak di event loop
+                    await loop.run_in_executor(executor, self.add_links, links, depth)
+                else:
+                    self.add_links(links, depth)
+            except Exception as e:
+                if self.on_error:
+                    self.on_error(url, e)
+            finally:
+                # URL yang belum sempat diambil tetap tertunda untuk checkpoint
+                self.frontier.task_done(item, requeue=not started)
+                if started:
+                    self._end_page()
@@ -0,0 +1,104 @@
+"""Benchmark ukuran dan waktu indexing: content disimpan di Whoosh vs schema ramping
+
+Dokumen sintetis di-index dengan BatchIndexer ke dua folder sementara, satu
+dengan content=TEXT(stored=True) dan satu dengan content hanya di-index dan
+teksnya di DocStore. Dilaporkan waktu indexing dengan pengaturan default
+crawl (commit per 100 dokumen, merge otomatis), ukuran segmen Whoosh dan
+DocStore, serta waktu highlight 10 hit teratas.
+
+Stored field Whoosh sendiri sudah dikompres zlib, jadi total ukuran di disk
+hampir sama; yang berkurang adalah segmen yang harus ditulis ulang setiap
+merge, sehingga indexing lebih cepat.
+
+Contoh:
+    python benchmarks/bench_index_schema.py --docs 2000
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crawler_core import default_schema  # noqa: E402
+from doc_store import DOC_STORE_NAME  # noqa: E402
+from indexer import BatchIndexer  # noqa: E402
+from search_service import SearchService  # noqa: E402
+
+WORDS = ("crawler index halaman berita artikel produk harga kategori jakarta bandung "
+         "teknologi ekonomi olahraga politik pendidikan kesehatan cuaca kota data web").split()
+
+
+def synthetic_documents(count, words_per_doc, seed=1):
+    rng = random.Random(seed)
+    for i in range(count):
+        text = " ".join(rng.choice(WORDS) + str(rng.randrange(500)) for _ in range(words_per_doc))
+        yield {
+            'url': f"https://www.example.com/artikel/{i}",
+            'title': f"Artikel {i} {rng.choice(WORDS)}",
+            'content': text,
+            'date': datetime.now()
+        }
+
+
+def folder_sizes(path):
+    """Return (ukuran file Whoosh, ukuran DocStore) dalam byte"""
+    whoosh_size = store_size = 0
+    for name in os.listdir(path):
+        size = os.path.getsize(os.path.join(path, name))
+        if name.startswith(DOC_STORE_NAME):
+            store_size += size
+        else:
+            whoosh_size += size
+    return whoosh_size, store_size
+
+
+def measure(name, store_content, args):
+    index_dir = tempfile.mkdtemp(prefix="bench_index_")
+    try:
+        schema = default_schema(store_content)
+        started = time.perf_counter()
+        indexer = BatchIndexer(index_dir, schema, batch_size=args.batch_size)
+        for fields in synthetic_documents(args.docs, args.words):
+            indexer.add_document(**fields)
+        indexer.close()
+        elapsed = time.perf_counter() - started
+
+        service = SearchService(index_dir, schema)
+        page = service.search_page(WORDS[0] + "1", 1, pagelen=10)
+        highlight_started = time.perf_counter()
+        for hit in page.hits:
+            service.highlight(WORDS[0] + "1", hit)
+        highlight_elapsed = time.perf_counter() - highlight_started
+        service.close()
+
+        whoosh_size, store_size = folder_sizes(index_dir)
+        size = whoosh_size + store_size
+        print(f"{name:<8} whoosh {whoosh_size / 1024 / 1024:6.1f} MB + docstore {store_size / 1024 / 1024:5.1f} MB"
+              f" | index {elapsed:6.1f} s"
+              f" ({args.docs / elapsed:6.0f} dok/s) | highlight 10 hit {highlight_elapsed * 1000:6.1f} ms")
+        return whoosh_size, size, elapsed
+    finally:
+        shutil.rmtree(index_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--docs', type=int, default=2000)
+    parser.add_argument('--words', type=int, default=400, help="jumlah kata per dokumen")
+    parser.add_argument('--batch-size', type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"{args.docs} dokumen sintetis, {args.words} kata per dokumen")
+    stored_whoosh, stored_total, stored_time = measure("stored", True, args)
+    slim_whoosh, slim_total, slim_time = measure("ramping", False, args)
+    print(f"ramping vs stored: segmen Whoosh {slim_whoosh / stored_whoosh - 1:+.1%}, "
+          f"total di disk {slim_total / stored_total - 1:+.1%}, waktu indexing {slim_time / stored_time - 1:+.1%}")
+
+
+if __name__ == "__main__":
+    main()
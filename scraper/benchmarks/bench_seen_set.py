@@ -0,0 +1,123 @@
+"""Benchmark memori dan kecepatan seen-set URL
+
+Membandingkan set Python berisi string URL dengan FingerprintSet dan
+BloomFilter dari url_seen, lalu memproyeksikan kebutuhan memori untuk
+crawl 10 juta URL.
+
+Seen-set bukan satu-satunya struktur yang tumbuh per halaman: --pages juga
+mengukur semua state per halaman yang di-crawl dan di-index (seen-set,
+fingerprint dokumen dan touched di BatchIndexer, serta PageStore jika
+manual index dipakai).
+
+Contoh:
+    python benchmarks/bench_seen_set.py --urls 1000000
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from page_store import PageStore  # noqa: E402
+from url_seen import BloomFilter, FingerprintMap, FingerprintSet  # noqa: E402
+
+TARGET_URLS = 10_000_000
+
+
+def synthetic_urls(count):
+    """URL ternormalisasi dengan panjang dan bentuk yang mirip crawl sungguhan"""
+    for i in range(count):
+        yield f"https://www.example{i % 997}.com/kategori/{i % 113}/artikel-{i}?page={i % 7}"
+
+
+class PythonSet:
+    """Seen-set lama: set berisi string URL lengkap"""
+
+    def __init__(self):
+        self._set = set()
+
+    def add(self, key):
+        if key in self._set:
+            return False
+        self._set.add(key)
+        return True
+
+
+def measure(name, factory, count):
+    tracemalloc.start()
+    started = time.perf_counter()
+    seen = factory()
+    for key in synthetic_urls(count):
+        seen.add(key)
+    elapsed = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    per_url = current / count
+    print(f"{name:<14} {per_url:7.1f} byte/URL | {current / 1024 / 1024:8.1f} MB"
+          f" | {count / elapsed / 1000:7.0f}k URL/s"
+          f" | proyeksi {TARGET_URLS // 1_000_000}M URL: {per_url * TARGET_URLS / 1024 ** 3:5.2f} GB")
+    return seen
+
+
+def per_page_state(kind, count):
+    """Isi state per halaman seperti crawl yang meng-index count halaman"""
+    page_store = PageStore() if kind == 'lama + page_store' else None
+    if kind == 'sekarang':
+        seen, fingerprints, touched = FingerprintSet(), FingerprintMap(), FingerprintSet()
+    else:
+        # Struktur sebelum fingerprint: set URL, dict url -> hash hex, set URL
+        seen, fingerprints, touched = set(), {}, set()
+
+    for i, key in enumerate(synthetic_urls(count)):
+        digest = f"{i:040x}"
+        seen.add(key)
+        touched.add(key)
+        if kind == 'sekarang':
+            fingerprints.put(key, int(digest[:15], 16) + 2)
+        else:
+            fingerprints[key] = digest
+        if page_store is not None:
+            page_store.record(key, title=f"Artikel {i}", status=200, digest=digest)
+    return seen, fingerprints, touched, page_store
+
+
+def measure_pages(count):
+    for kind in ('lama + page_store', 'lama', 'sekarang'):
+        tracemalloc.start()
+        state = per_page_state(kind, count)
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        per_page = current / count
+        print(f"{kind:<18} {per_page:7.1f} byte/halaman"
+              f" | proyeksi {TARGET_URLS // 1_000_000}M halaman: {per_page * TARGET_URLS / 1024 ** 3:5.2f} GB")
+        del state
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--urls', type=int, default=1_000_000)
+    parser.add_argument('--error-rate', type=float, default=0.001)
+    parser.add_argument('--pages', type=int, default=200_000,
+                        help="jumlah halaman untuk mengukur state per halaman, 0 untuk melewati")
+    args = parser.parse_args()
+
+    print(f"{args.urls} URL sintetis")
+    measure("set(str)", PythonSet, args.urls)
+    measure("fingerprint", FingerprintSet, args.urls)
+    bloom = measure("bloom", lambda: BloomFilter(args.urls, args.error_rate), args.urls)
+
+    # False positive: URL baru yang dianggap sudah pernah dilihat
+    probes = 100_000
+    false_positives = sum(f"https://belum-pernah.example/{i}" in bloom for i in range(probes))
+    print(f"bloom false positive: {false_positives / probes:.4%} (target {args.error_rate:.4%})")
+
+    if args.pages:
+        print(f"\nState per halaman (seen-set + index + page_store), {args.pages} halaman")
+        measure_pages(args.pages)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark waktu startup aplikasi GUI
+
+Mengukur dua hal:
+- import: waktu `python -c "import scraper"` (tanpa window, bisa jalan di server)
+- window: waktu sejak proses dijalankan sampai window pertama tampil,
+  lewat flag --benchmark-startup di scraper.py (butuh display)
+
+Contoh:
+    python benchmarks/bench_startup.py --runs 10
+    python benchmarks/bench_startup.py --import-only
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure_import():
+    """Waktu proses Python baru yang hanya meng-import modul scraper, dalam ms"""
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import scraper"], cwd=APP_DIR, check=True)
+    return (time.perf_counter() - started) * 1000
+
+
+def measure_window():
+    """Waktu sampai window pertama tampil menurut scraper.py, dalam ms"""
+    env = dict(os.environ, SCRAPER_STARTUP_T0=repr(time.time()))
+    output = subprocess.run([sys.executable, "scraper.py", "--benchmark-startup"],
+                            cwd=APP_DIR, env=env, check=True,
+                            capture_output=True, text=True).stdout
+    for line in output.splitlines():
+        if line.startswith("startup_ms="):
+            return float(line.split("=", 1)[1])
+    raise RuntimeError(f"scraper.py tidak melaporkan waktu startup:\n{output}")
+
+
+def report(name, samples):
+    print(f"{name:<8} min {min(samples):7.1f} ms | median {statistics.median(samples):7.1f} ms"
+          f" | max {max(samples):7.1f} ms ({len(samples)} run)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--import-only', action='store_true', help="lewati pengukuran window (tanpa display)")
+    args = parser.parse_args()
+
+    report("import", [measure_import() for _ in range(args.runs)])
+    if not args.import_only:
+        report("window", [measure_window() for _ in range(args.runs)])
+
+
+if __name__ == "__main__":
+    main()
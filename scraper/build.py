@@ -1,9 +1,17 @@
-import PyInstaller.__main__
+import importlib.util
 import os
 import shutil
+import sys
 
-def build_exe():
-    """Build executable dengan PyInstaller"""
+def build_exe(onedir=False):
+    """Build executable dengan PyInstaller
+
+    onedir=True menghasilkan folder berisi executable dan library. Startup lebih
+    cepat karena tidak perlu mengekstrak arsip --onefile ke folder temp setiap kali
+    aplikasi dijalankan.
+    """
+    import PyInstaller.__main__
+    
     print("Memulai proses build executable...")
     
     # Hapus folder build dan dist jika ada
@@ -15,7 +23,7 @@ def build_exe():
     PyInstaller.__main__.run([
         'scraper.py',  # Script utama
         '--name=WebCrawler',  # Nama executable
-        '--onefile',  # Buat single executable
+        '--onedir' if onedir else '--onefile',  # Folder atau single executable
         '--windowed',  # Tanpa console window
         '--icon=icon.png',  # Icon aplikasi
         '--add-data=icon.png;.',  # Include icon.png
@@ -27,13 +35,9 @@ def build_exe():
 
 if __name__ == "__main__":
     # Instal PyInstaller jika belum ada
-    try:
-        import pkg_resources
-        pkg_resources.get_distribution('pyinstaller')
-    except pkg_resources.DistributionNotFound:
+    if importlib.util.find_spec('PyInstaller') is None:
         print("Menginstal PyInstaller...")
         import subprocess
-        import sys
         subprocess.check_call([sys.executable, "-m", "pip", "install", "pyinstaller"])
     
-    build_exe() 
\ No newline at end of file
+    build_exe(onedir='--onedir' in sys.argv) 
\ No newline at end of file
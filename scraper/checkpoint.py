@@ -0,0 +1,32 @@
+"""Checkpoint state crawl ke disk supaya crawl yang terhenti bisa dilanjutkan"""
+import gzip
+import json
+import os
+
+# 2: daftar URL yang sudah di-index disimpan sebagai state FingerprintSet
+# 3: state FingerprintSet berupa array slot lengkap yang dikompres zlib
+CHECKPOINT_VERSION = 3
+CHECKPOINT_SUFFIX = '.checkpoint.json.gz'
+
+
+def save_checkpoint(path, state):
+    """Tulis state sebagai JSON gzip secara atomic (file lama tetap utuh jika proses mati di tengah)"""
+    tmp_path = path + '.tmp'
+    with gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=6) as f:
+        json.dump(dict(state, version=CHECKPOINT_VERSION), f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path):
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        state = json.load(f)
+    if state.get('version') != CHECKPOINT_VERSION:
+        raise ValueError(f"Versi checkpoint {state.get('version')} tidak didukung")
+    return state
+
+
+def remove_checkpoint(path):
+    """Hapus checkpoint setelah crawl selesai lengkap"""
+    for candidate in (path, path + '.tmp'):
+        if os.path.exists(candidate):
+            os.remove(candidate)
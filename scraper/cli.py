@@ -0,0 +1,199 @@
+"""Menjalankan crawl dari command line tanpa GUI
+
+Contoh:
+    python cli.py https://example.com --depth 2 --selectors "p, h1" --export hasil.csv.gz
+"""
+import argparse
+import sys
+import threading
+
+import page_parser
+from crawler_core import CrawlConfig, Crawler, MODES, FETCH_MODES, create_indexer, ensure_scheme, index_results
+from url_scope import BLOCKED_EXTENSIONS, SCOPES
+
+
+# Opsi command line -> field CrawlConfig yang diisinya, untuk membandingkan opsi dengan checkpoint
+OPTION_FIELDS = {
+    'url': ('start_url',), 'depth': ('max_depth',), 'mode': ('mode',), 'selectors': ('selectors',),
+    'workers': ('num_workers',), 'delay': ('delay_min', 'delay_max'), 'fetch_mode': ('fetch_mode',),
+    'parser': ('parser_backend',), 'index': ('auto_index', 'record_pages'), 'index_dir': ('index_dir',),
+    'prune': ('prune_index',), 'slim_index': ('store_content',), 'scope': ('domain_scope',),
+    'include': ('include_patterns',), 'exclude': ('exclude_patterns',),
+    'allow_all_extensions': ('blocked_extensions',), 'max_body_size': ('max_body_size',),
+    'max_pages': ('max_pages',), 'results_dir': ('results_dir',), 'cache': ('cache_path',),
+    'no_cache': ('cache_path',), 'respect_robots': ('respect_robots',), 'robots_cache': ('robots_cache_path',),
+    'seen_set': ('seen_set',), 'bloom_capacity': ('seen_capacity',), 'bloom_error_rate': ('seen_error_rate',),
+    'checkpoint_interval': ('checkpoint_interval',)
+}
+
+
+def build_parser(explicit_only=False):
+    """Parser argumen; explicit_only=True tanpa nilai default, sehingga hanya opsi yang diberikan yang muncul"""
+    def default(value):
+        return argparse.SUPPRESS if explicit_only else value
+
+    parser = argparse.ArgumentParser(description="Web crawler dan scraper tanpa GUI")
+    parser.add_argument('url', nargs='?', default=default(None), help="URL awal crawl (tidak perlu dengan --resume)")
+    parser.add_argument('--resume', metavar='CHECKPOINT',
+                        help="lanjutkan crawl dari file .checkpoint.json.gz; pengaturan diambil dari checkpoint, "
+                             "hanya --max-pages, --workers, --delay, --fetch-mode dan --checkpoint-interval "
+                             "yang boleh diubah")
+    parser.add_argument('--depth', type=int, default=default(2), help="kedalaman maksimal (default: 2)")
+    parser.add_argument('--mode', choices=MODES, default=default('both'), help="mode operasi (default: both)")
+    parser.add_argument('--selectors', default=default('p, h1, h2, h3'),
+                        help="CSS selector untuk scraping, dipisah koma")
+    parser.add_argument('--workers', type=int, default=default(4), help="jumlah worker fetch paralel (default: 4)")
+    parser.add_argument('--delay', type=float, nargs=2, metavar=('MIN', 'MAX'), default=default((2.0, 5.0)),
+                        help="jeda acak per host dalam detik (default: 2 5)")
+    parser.add_argument('--fetch-mode', choices=FETCH_MODES, default=default('threaded'),
+                        help="backend fetch (default: threaded)")
+    parser.add_argument('--parser', choices=page_parser.PARSER_BACKENDS, default=default('auto'),
+                        help="backend parser HTML")
+    parser.add_argument('--index', choices=('auto', 'manual', 'off'), default=default('auto'),
+                        help="auto: index selama crawl, manual: index hasil scraping setelah crawl, off: tanpa index")
+    parser.add_argument('--index-dir', default=default('search_index'), help="folder index Whoosh")
+    parser.add_argument('--prune', action='store_true', default=default(False),
+                        help="hapus dokumen halaman yang tidak ditemukan lagi dari index, hanya setelah crawl "
+                             "lengkap dengan kedalaman dan cakupan yang sama dengan crawl sebelumnya")
+    parser.add_argument('--slim-index', action='store_true', default=default(False),
+                        help="index baru tanpa menyimpan content di Whoosh, teks disimpan terkompresi terpisah")
+    parser.add_argument('--scope', choices=SCOPES, default=default('domain'),
+                        help="host: hanya host URL awal, domain: termasuk subdomain (default), all: semua situs")
+    parser.add_argument('--include', action='append', default=default([]), metavar='REGEX',
+                        help="hanya ikuti URL yang cocok dengan regex ini (bisa diulang)")
+    parser.add_argument('--exclude', action='append', default=default([]), metavar='REGEX',
+                        help="jangan ikuti URL yang cocok dengan regex ini (bisa diulang)")
+    parser.add_argument('--allow-all-extensions', action='store_true', default=default(False),
+                        help="ikuti juga link ke file seperti .pdf, .jpg dan .zip")
+    parser.add_argument('--max-body-size', type=float, default=default(10), metavar='MB',
+                        help="lewati respons yang lebih besar dari ini (default: 10 MB, 0 tanpa batas)")
+    parser.add_argument('--max-pages', type=int, default=default(None),
+                        help="batas jumlah halaman, termasuk halaman sebelum resume")
+    parser.add_argument('--results-dir', default=default('results'), help="folder file .jsonl hasil scraping")
+    parser.add_argument('--cache', default=default('http_cache.sqlite'), metavar='PATH',
+                        help="file cache HTTP untuk request kondisional (default: http_cache.sqlite)")
+    parser.add_argument('--no-cache', action='store_true', default=default(False), help="crawl tanpa cache HTTP")
+    parser.add_argument('--respect-robots', action='store_true', default=default(False),
+                        help="jangan ambil URL yang dilarang robots.txt, Crawl-delay ikut dipakai")
+    parser.add_argument('--robots-cache', default=default('robots_cache.sqlite'), metavar='PATH',
+                        help="file cache robots.txt per host (default: robots_cache.sqlite)")
+    parser.add_argument('--seen-set', choices=('exact', 'bloom'), default=default('exact'),
+                        help="exact: fingerprint 64-bit (~11-23 byte/URL), bloom: Bloom filter (~1.8 byte/URL)")
+    parser.add_argument('--bloom-capacity', type=int, default=default(10_000_000),
+                        help="perkiraan jumlah URL untuk Bloom filter")
+    parser.add_argument('--bloom-error-rate', type=float, default=default(0.001),
+                        help="peluang false positive Bloom filter")
+    parser.add_argument('--checkpoint-interval', type=float, default=default(60), metavar='SECONDS',
+                        help="interval checkpoint untuk resume, 0 untuk mematikan (default: 60)")
+    parser.add_argument('--export', metavar='PATH',
+                        help="ekspor hasil ke .json, .jsonl, .csv, .csv.gz atau .parquet setelah crawl")
+    parser.add_argument('-v', '--verbose', action='store_true', default=default(False),
+                        help="tampilkan pesan per halaman")
+    return parser
+
+
+def config_from_args(args):
+    """CrawlConfig dari argumen command line"""
+    return CrawlConfig(
+        start_url=ensure_scheme(args.url or ''),
+        max_depth=args.depth,
+        mode=args.mode,
+        selectors=args.selectors,
+        parser_backend=args.parser,
+        auto_index=args.index == 'auto',
+        record_pages=args.index == 'manual',
+        num_workers=args.workers,
+        delay_min=args.delay[0],
+        delay_max=args.delay[1],
+        fetch_mode=args.fetch_mode,
+        max_pages=args.max_pages,
+        domain_scope=args.scope,
+        include_patterns=tuple(args.include),
+        exclude_patterns=tuple(args.exclude),
+        blocked_extensions=() if args.allow_all_extensions else BLOCKED_EXTENSIONS,
+        max_body_size=int(args.max_body_size * 1024 * 1024) or None,
+        index_dir=args.index_dir,
+        prune_index=args.prune,
+        store_content=not args.slim_index,
+        results_dir=args.results_dir,
+        cache_path=None if args.no_cache else args.cache,
+        respect_robots=args.respect_robots,
+        robots_cache_path=args.robots_cache,
+        checkpoint_interval=args.checkpoint_interval,
+        seen_set=args.seen_set,
+        seen_capacity=args.bloom_capacity,
+        seen_error_rate=args.bloom_error_rate
+    )
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.url and not args.resume:
+        parser.error("URL awal atau --resume harus diisi")
+
+    config = config_from_args(args)
+
+    def on_event(kind, message):
+        if kind == 'finished' or (kind == 'page' and not args.verbose):
+            return
+        stream = sys.stderr if kind == 'error' else sys.stdout
+        stream.write(f"ERROR: {message}" if kind == 'error' else message)
+        stream.flush()
+
+    try:
+        if args.resume:
+            # Opsi yang diberikan bersama --resume diteruskan; yang bertentangan dengan checkpoint ditolak
+            given = vars(build_parser(explicit_only=True).parse_args(argv))
+            overrides = {field: getattr(config, field)
+                         for option in given if option in OPTION_FIELDS for field in OPTION_FIELDS[option]}
+            crawler = Crawler.resume(args.resume, on_event=on_event, **overrides)
+            config = crawler.config
+        else:
+            crawler = Crawler(config, on_event=on_event)
+    except Exception as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 2
+
+    # Crawl jalan di thread sendiri supaya Ctrl+C bisa menghentikannya dengan rapi.
+    # Ditunggu lewat Event, bukan join(): join yang terpotong KeyboardInterrupt
+    # bisa langsung return pada join berikutnya walaupun thread masih jalan.
+    done = threading.Event()
+
+    def run():
+        try:
+            crawler.run()
+        finally:
+            done.set()
+
+    threading.Thread(target=run, name="crawler").start()
+    try:
+        while not done.wait(0.5):
+            pass
+    except KeyboardInterrupt:
+        print("Menghentikan crawling...", file=sys.stderr)
+        crawler.stop()
+        done.wait()
+
+    result_sink = crawler.result_sink
+    # Mode index diambil dari config crawler, yang untuk resume berasal dari checkpoint
+    if config.record_pages and result_sink.count:
+        page_count, item_count = index_results(result_sink, crawler.page_store, create_indexer(config, crawler.schema))
+        print(f"Berhasil mengindex {page_count} halaman ({item_count} item)")
+
+    if args.export:
+        if not result_sink.count:
+            print("Tidak ada data yang bisa diekspor", file=sys.stderr)
+        else:
+            try:
+                result_sink.export(args.export)
+                print(f"Data berhasil disimpan ke: {args.export}")
+            except Exception as e:
+                print(f"Gagal menyimpan file: {str(e)}", file=sys.stderr)
+                return 1
+
+    return 130 if crawler.stopped else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
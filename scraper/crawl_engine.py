@@ -0,0 +1,455 @@
+"""Mesin crawling berbasis frontier (breadth-first) dengan seen-set URL"""
+import heapq
+import itertools
+import random
+import threading
+import time
+from collections import deque, namedtuple
+from contextlib import contextmanager
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode, urldefrag
+
+from url_seen import FingerprintSet, describe_memory
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# Hasil fetch yang diteruskan ke tahap proses, sama untuk backend thread dan async.
+# Untuk respons 304 text bernilai None dan cache_entry berisi entri HttpCache.
+FetchResult = namedtuple('FetchResult', ['url', 'status_code', 'text', 'etag', 'last_modified', 'cache_entry'],
+                         defaults=(None, None, None))
+
+
+def normalize_url(url):
+    """Normalisasi URL untuk kunci seen-set (fragment, port default, trailing slash, urutan query)"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+
+    host = (parts.hostname or '').lower()
+    if ':' in host:
+        # Alamat IPv6 harus tetap di dalam kurung siku
+        host = f'[{host}]'
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port and port != DEFAULT_PORTS.get(scheme):
+        host = f'{host}:{port}'
+    if parts.username:
+        userinfo = parts.username
+        if parts.password:
+            userinfo += f':{parts.password}'
+        host = f'{userinfo}@{host}'
+
+    path = parts.path or '/'
+    if len(path) > 1 and path.endswith('/'):
+        path = path.rstrip('/') or '/'
+
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+
+    return urlunsplit((scheme, host, path, query, ''))
+
+
+def url_host(url):
+    """Kunci host untuk penjadwalan per host"""
+    return urlsplit(url).netloc.lower()
+
+
+class Frontier:
+    """Antrian URL breadth-first yang thread-safe; setiap URL hanya masuk sekali per run
+
+    seen adalah seen-set dari url_seen (default FingerprintSet), yang menyimpan
+    fingerprint URL ternormalisasi alih-alih string URL lengkap.
+
+    admit(url) (opsional) dicek sekali untuk setiap URL baru sebelum masuk
+    antrian, di luar lock karena bisa lambat (misalnya mengambil robots.txt).
+    URL yang ditolak tetap tercatat di seen-set sehingga tidak dicek ulang.
+
+    URL diantre per host dan host bergiliran lewat heap waktu siap. Jika
+    scheduler (HostScheduler) diberikan, pop() hanya memberikan URL dari host
+    yang slot request-nya sudah tiba dan langsung memesan slot itu, sehingga
+    worker tidak menunggu host yang sibuk selama host lain sudah siap.
+
+    on_change (opsional) dipanggil tanpa argumen di luar lock setiap kali URL
+    masuk antrian atau item selesai, untuk membangunkan worker yang tidak
+    bisa menunggu Condition (misalnya coroutine asyncio).
+    """
+
+    def __init__(self, seen=None, admit=None, scheduler=None):
+        self._hosts = {}  # host -> deque (url, depth), hanya host yang masih punya URL tertunda
+        self._ready = []  # heap (waktu siap, urutan, host), satu entri per host di _hosts
+        self._order = itertools.count()
+        self._size = 0
+        self._seen = seen if seen is not None else FingerprintSet()
+        self._admit = admit
+        self._scheduler = scheduler
+        self._in_progress = set()  # item hasil pop() yang belum task_done()
+        self._cond = threading.Condition()
+        self.on_change = None
+
+    def _changed(self):
+        if self.on_change:
+            self.on_change()
+
+    def add(self, url, depth):
+        """Tambahkan URL ke frontier, return False jika URL sudah pernah dilihat"""
+        url = urldefrag(url)[0]
+        if not url.startswith(('http://', 'https://')):
+            return False
+
+        key = normalize_url(url)
+        with self._cond:
+            if not self._seen.add(key):
+                return False
+        if self._admit and not self._admit(url):
+            return False
+
+        with self._cond:
+            self._append((url, depth))
+            self._cond.notify()
+        self._changed()
+        return True
+
+    def _append(self, item, front=False):
+        host = url_host(item[0])
+        queue = self._hosts.get(host)
+        if queue is None:
+            queue = self._hosts[host] = deque()
+            heapq.heappush(self._ready, (self._ready_at(item[0]), next(self._order), host))
+        if front:
+            queue.appendleft(item)
+        else:
+            queue.append(item)
+        self._size += 1
+
+    def _ready_at(self, url):
+        return self._scheduler.ready_at(url) if self._scheduler else 0
+
+    def _pop_ready(self):
+        """Return (item, None) dari host yang sudah siap, atau (None, detik sampai host berikutnya siap)"""
+        while self._ready:
+            ready, order, host = self._ready[0]
+            now = time.monotonic()
+            if ready > now:
+                return None, ready - now
+            queue = self._hosts[host]
+            url = queue[0][0]
+            if self._scheduler and not self._scheduler.try_reserve(url):
+                # Slot host sudah dipesan di luar frontier (misalnya retry 403) atau jedanya berubah
+                heapq.heapreplace(self._ready, (self._ready_at(url), order, host))
+                continue
+
+            heapq.heappop(self._ready)
+            item = queue.popleft()
+            self._size -= 1
+            if queue:
+                heapq.heappush(self._ready, (self._ready_at(url), next(self._order), host))
+            else:
+                del self._hosts[host]
+            return item, None
+        return None, None
+
+    def pop(self, timeout=None):
+        """Ambil URL berikutnya dari host yang sudah siap, return None jika tidak ada sampai timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                item, wait = self._pop_ready()
+                if item is not None:
+                    self._in_progress.add(item)
+                    return item
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                if wait is not None and (remaining is None or wait < remaining):
+                    remaining = wait
+                self._cond.wait(remaining)
+
+    def pop_nowait(self):
+        """Versi pop() tanpa menunggu: return (item, None), atau (None, detik sampai host berikutnya siap)
+
+        Detik tunggu None berarti tidak ada URL tertunda sama sekali.
+        """
+        with self._cond:
+            item, wait = self._pop_ready()
+            if item is not None:
+                self._in_progress.add(item)
+            return item, wait
+
+    def task_done(self, item, requeue=False):
+        """Tandai item hasil pop() selesai diproses (setelah link-nya ditambahkan)
+
+        requeue=True mengembalikan item ke depan antrian host-nya, untuk URL
+        yang belum sempat diambil saat crawl dihentikan.
+        """
+        with self._cond:
+            self._in_progress.discard(item)
+            if requeue:
+                self._append(item, front=True)
+                self._cond.notify()
+            if not self._size and not self._in_progress:
+                self._cond.notify_all()
+        self._changed()
+
+    def is_done(self):
+        with self._cond:
+            return not self._size and not self._in_progress
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def seen_count(self):
+        return len(self._seen)
+
+    @property
+    def seen_nbytes(self):
+        return self._seen.nbytes
+
+    def seen_summary(self):
+        with self._cond:
+            return describe_memory(self._seen)
+
+    def snapshot(self):
+        """Return (URL tertunda termasuk yang sedang diproses, salinan seen-set) untuk checkpoint
+
+        Serialisasi seen-set (to_state) dilakukan pemanggil di luar lock.
+        """
+        with self._cond:
+            pending = list(self._in_progress)
+            for queue in self._hosts.values():
+                pending.extend(queue)
+            return pending, self._seen.copy()
+
+    def restore(self, pending, seen):
+        """Isi frontier dari snapshot() sebelum crawl dimulai"""
+        with self._cond:
+            self._seen.load_state(seen)
+            for url, depth in pending:
+                self._append((url, depth))
+            self._cond.notify_all()
+        self._changed()
+
+
+class HostScheduler:
+    """Jeda acak antar request ke host yang sama, host berbeda tidak saling menunggu
+
+    Frontier memakai ready_at() dan try_reserve() untuk memilih host yang
+    sudah siap; reserve() dan wait() untuk request ulang ke host yang sama.
+    """
+
+    def __init__(self, delay_min, delay_max):
+        self.delay_min = delay_min
+        self.delay_max = max(delay_min, delay_max)
+        self._next_slot = {}
+        self._min_delay = {}  # jeda minimum per host, misalnya Crawl-delay dari robots.txt
+        self._lock = threading.Lock()
+
+    def set_min_delay(self, url, seconds):
+        """Jeda antar request ke host URL tidak pernah kurang dari seconds"""
+        with self._lock:
+            self._min_delay[url_host(url)] = seconds
+
+    def _book(self, host, slot):
+        delay = random.uniform(self.delay_min, self.delay_max)
+        self._next_slot[host] = slot + max(delay, self._min_delay.get(host, 0))
+
+    def reserve(self, url):
+        """Pesan slot request berikutnya untuk host URL, return detik yang harus ditunggu"""
+        host = url_host(url)
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._book(host, slot)
+        return slot - now
+
+    def ready_at(self, url):
+        """Waktu time.monotonic() saat host URL boleh di-request lagi"""
+        with self._lock:
+            return self._next_slot.get(url_host(url), 0)
+
+    def try_reserve(self, url):
+        """Pesan slot host URL hanya jika sudah tiba, return False jika host masih harus menunggu"""
+        host = url_host(url)
+        with self._lock:
+            now = time.monotonic()
+            if self._next_slot.get(host, now) > now:
+                return False
+            self._book(host, now)
+        return True
+
+    def snapshot(self):
+        """Sisa jeda per host dalam detik (waktu monotonic tidak berlaku antar proses)"""
+        with self._lock:
+            now = time.monotonic()
+            return {host: slot - now for host, slot in self._next_slot.items() if slot > now}
+
+    def restore(self, remaining):
+        with self._lock:
+            now = time.monotonic()
+            for host, delay in remaining.items():
+                self._next_slot[host] = now + delay
+
+    def backoff_delay(self):
+        """Jeda tambahan setelah respons 403 (dua kali jeda normal)"""
+        return random.uniform(self.delay_min, self.delay_max) * 2
+
+    def wait(self, url, is_active=None):
+        """Tunggu slot host, return False jika crawl dihentikan selama menunggu"""
+        return sleep_while_active(self.reserve(url), is_active)
+
+    def backoff(self, url, is_active=None):
+        """Setelah respons 403: jeda tambahan lalu tunggu slot host, return False jika crawl dihentikan"""
+        return sleep_while_active(self.backoff_delay(), is_active) and self.wait(url, is_active)
+
+
+def sleep_while_active(seconds, is_active=None, step=0.2):
+    """Tidur sampai seconds detik, return False segera jika is_active() menjadi False"""
+    deadline = time.monotonic() + seconds
+    remaining = seconds
+    while remaining > 0:
+        if is_active and not is_active():
+            return False
+        time.sleep(min(remaining, step))
+        remaining = deadline - time.monotonic()
+    return not is_active or is_active()
+
+
+class CrawlEngine:
+    """Crawl breadth-first tanpa rekursi dengan pool worker
+
+    handler(url, depth) mengambil dan memproses satu halaman, lalu
+    mengembalikan daftar link absolut yang ditemukan (atau None).
+    Jika scheduler diberikan, frontier hanya memberikan URL yang slot host-nya
+    sudah tiba (lihat Frontier).
+    url_filter(url) menolak URL sebelum masuk frontier (lihat Frontier).
+    """
+
+    def __init__(self, handler, max_depth, follow_links=True, is_active=None, max_pages=None,
+                 num_workers=1, scheduler=None, on_error=None, seen=None, url_filter=None):
+        self.handler = handler
+        self.max_depth = max_depth
+        self.follow_links = follow_links
+        self.is_active = is_active or (lambda: True)
+        self.max_pages = max_pages
+        self.num_workers = max(1, num_workers)
+        self.scheduler = scheduler
+        self.on_error = on_error
+        self.url_filter = url_filter
+        self.frontier = Frontier(seen, admit=url_filter, scheduler=scheduler)
+        self.pages_crawled = 0
+        self._claimed = 0
+        self._lock = threading.Lock()
+
+        # Jumlah halaman yang sedang diproses handler; paused() menunggu sampai nol
+        self._busy = 0
+        self._paused = False
+        self._gate = threading.Condition()
+
+    def run(self, start_url):
+        self.frontier.add(start_url, 0)
+
+        workers = [
+            threading.Thread(target=self._worker, name=f"crawl-worker-{i}", daemon=True)
+            for i in range(self.num_workers)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        return self.pages_crawled
+
+    def _begin_page(self):
+        with self._gate:
+            while self._paused:
+                self._gate.wait()
+            self._busy += 1
+
+    def _end_page(self):
+        with self._gate:
+            self._busy -= 1
+            self._gate.notify_all()
+
+    @contextmanager
+    def paused(self):
+        """Tahan worker sebelum halaman berikutnya dan tunggu halaman yang sedang diproses selesai
+
+        Selama blok ini frontier, hasil dan index konsisten satu sama lain,
+        sehingga aman untuk diambil snapshot-nya.
+        """
+        with self._gate:
+            self._paused = True
+            while self._busy:
+                self._gate.wait()
+        try:
+            yield
+        finally:
+            with self._gate:
+                self._paused = False
+                self._gate.notify_all()
+
+    def snapshot(self):
+        """State untuk melanjutkan crawl, dipanggil di dalam paused() atau setelah run() selesai
+
+        'seen' berisi salinan seen-set; panggil to_state() sebelum disimpan,
+        sebaiknya setelah keluar dari paused().
+        """
+        pending, seen = self.frontier.snapshot()
+        return {
+            'pending': pending,
+            'seen': seen,
+            'pages_crawled': self.pages_crawled,
+            'hosts': self.scheduler.snapshot() if self.scheduler else {}
+        }
+
+    def restore(self, state):
+        """Muat state dari snapshot() sebelum run()"""
+        self.frontier.restore(state['pending'], state['seen'])
+        self.pages_crawled = self._claimed = state['pages_crawled']
+        if self.scheduler:
+            self.scheduler.restore(state['hosts'])
+
+    def _claim_page(self):
+        """Cek batas max_pages sebelum sebuah halaman diambil"""
+        with self._lock:
+            if self.max_pages and self._claimed >= self.max_pages:
+                return False
+            self._claimed += 1
+            return True
+
+    def add_links(self, links, depth):
+        """Masukkan link dari halaman di kedalaman depth ke frontier"""
+        # Link hanya diikuti selama belum mencapai kedalaman maksimal
+        if self.follow_links and links and depth < self.max_depth:
+            for link in links:
+                self.frontier.add(link, depth + 1)
+
+    def _worker(self):
+        while self.is_active():
+            item = self.frontier.pop(timeout=0.2)
+            if item is None:
+                if self.frontier.is_done():
+                    break
+                continue
+
+            url, depth = item
+            started = False
+            try:
+                # Slot host sudah dipesan oleh frontier.pop()
+                if not self._claim_page():
+                    break
+
+                self._begin_page()
+                started = True
+                links = self.handler(url, depth)
+                with self._lock:
+                    self.pages_crawled += 1
+
+                self.add_links(links, depth)
+            except Exception as e:
+                if self.on_error:
+                    self.on_error(url, e)
+            finally:
+                # URL yang belum sempat diambil tetap tertunda untuk checkpoint
+                self.frontier.task_done(item, requeue=not started)
+                if started:
+                    self._end_page()
@@ -0,0 +1,748 @@
+"""Inti crawler tanpa GUI: konfigurasi, engine, indexing dan penyimpanan hasil
+
+Dipakai oleh aplikasi Tkinter (scraper.py) dan command line (cli.py).
+"""
+import itertools
+import json
+import os
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+import requests
+from whoosh.fields import Schema, TEXT, ID, DATETIME
+
+import async_fetcher
+import page_parser
+from checkpoint import CHECKPOINT_SUFFIX, load_checkpoint, remove_checkpoint, save_checkpoint
+from crawl_engine import CrawlEngine, HostScheduler, FetchResult
+from http_cache import HttpCache
+from http_client import ResponseSkipped, SessionManager, read_text
+from indexer import BatchIndexer, IndexWorker
+from page_store import PageStore, content_hash
+from result_sink import JsonlSink
+from robots_cache import RobotsCache
+from url_scope import BLOCKED_EXTENSIONS, SCOPES, ScopeFilter
+from url_seen import SEEN_SET_KINDS, create_seen_set
+
+MODES = ('crawl', 'scrape', 'both')
+FETCH_MODES = ('threaded', 'async')
+
+# Pengaturan yang boleh diubah saat melanjutkan crawl; pengaturan lain menentukan
+# seen-set, file hasil dan index di checkpoint sehingga harus sama
+RESUME_OPTIONS = ('max_pages', 'num_workers', 'delay_min', 'delay_max', 'fetch_mode', 'timeout',
+                  'max_retries', 'pool_connections', 'pool_maxsize', 'checkpoint_interval')
+
+USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:89.0) Gecko/20100101 Firefox/89.0',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.1.1 Safari/605.1.15',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Edge/91.0.864.59',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+]
+
+
+def get_random_headers():
+    """Generate random headers untuk bypass detection"""
+    return {
+        'User-Agent': random.choice(USER_AGENTS),
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.5',
+        'Accept-Encoding': 'gzip, deflate, br',
+        'DNT': '1',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1',
+        'Cache-Control': 'max-age=0'
+    }
+
+
+def default_schema(store_content=True):
+    """Schema Whoosh untuk index halaman
+
+    store_content=False membuat schema ramping: content hanya di-index, teks
+    lengkapnya disimpan terkompresi di DocStore (lihat doc_store.py).
+    """
+    return Schema(
+        url=ID(stored=True, unique=True),
+        title=TEXT(stored=True),
+        content=TEXT(stored=store_content),
+        date=DATETIME(stored=True),
+        fingerprint=ID(stored=True)
+    )
+
+
+def ensure_scheme(url):
+    """Menambahkan http:// secara otomatis jika tidak ada protokol"""
+    url = url.strip()
+    if url and not url.startswith(('http://', 'https://')):
+        url = 'http://' + url
+    return url
+
+
+# Cakupan crawl lengkap terakhir per URL awal, disimpan di folder index
+COVERAGE_FILE = 'crawl_coverage.json'
+
+
+def crawl_coverage(config):
+    """Pengaturan yang menentukan URL mana yang bisa dicapai sebuah crawl"""
+    return {
+        'max_depth': config.max_depth,
+        'domain_scope': config.domain_scope,
+        'include_patterns': list(config.include_patterns),
+        'exclude_patterns': list(config.exclude_patterns),
+        'blocked_extensions': list(config.blocked_extensions),
+        'respect_robots': config.respect_robots
+    }
+
+
+def covers(coverage, previous):
+    """True jika crawl dengan coverage mencapai semua URL yang dicapai crawl previous"""
+    return (coverage['max_depth'] >= previous['max_depth'] and
+            all(coverage[key] == value for key, value in previous.items() if key != 'max_depth'))
+
+
+def load_coverage(index_dir):
+    try:
+        with open(os.path.join(index_dir, COVERAGE_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_coverage(index_dir, coverages):
+    path = os.path.join(index_dir, COVERAGE_FILE)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(coverages, f, ensure_ascii=False, indent=2)
+    os.replace(path + '.tmp', path)
+
+
+def site_prefix(url):
+    """Awalan URL situs (scheme://host/) untuk membatasi penghapusan dokumen index"""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}/"
+
+
+@dataclass
+class CrawlConfig:
+    """Semua input satu job crawl, di-snapshot sebelum crawl dimulai"""
+
+    start_url: str
+    max_depth: int = 2
+    mode: str = 'both'
+    selectors: str = 'p, h1, h2, h3'
+    parser_backend: str = 'auto'
+    auto_index: bool = True
+    record_pages: bool = False  # simpan metadata halaman di page_store (di memori) untuk manual index
+    num_workers: int = 4
+    delay_min: float = 2.0
+    delay_max: float = 5.0
+    fetch_mode: str = 'threaded'
+    max_pages: Optional[int] = None
+    domain_scope: str = 'domain'  # 'host', 'domain' (termasuk subdomain) atau 'all'
+    include_patterns: Tuple[str, ...] = ()  # regex URL; jika diisi, hanya URL yang cocok yang diikuti
+    exclude_patterns: Tuple[str, ...] = ()  # regex URL yang tidak pernah diikuti
+    blocked_extensions: Tuple[str, ...] = BLOCKED_EXTENSIONS
+    max_body_size: Optional[int] = 10 * 1024 * 1024  # byte; respons lebih besar dilewati
+    timeout: float = 30
+    max_retries: int = 3
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    index_dir: str = 'search_index'
+    index_batch_size: int = 100
+    commit_interval: float = 5.0
+    merge_policy: str = 'auto'
+    index_queue_size: int = 500
+    # Opt-in: hapus dokumen situs yang tidak ditemukan lagi, hanya setelah crawl lengkap
+    # yang cakupannya sama dengan crawl sebelumnya (lihat Crawler.prune_index)
+    prune_index: bool = False
+    store_content: bool = True  # False: content tidak disimpan di Whoosh (hanya berlaku untuk index baru)
+    results_dir: str = 'results'
+    sink_batch_size: int = 200
+    cache_path: Optional[str] = 'http_cache.sqlite'  # None: tanpa cache HTTP
+    respect_robots: bool = False  # True: URL yang dilarang robots.txt tidak diambil
+    robots_cache_path: Optional[str] = 'robots_cache.sqlite'  # None: robots.txt hanya di-cache di memori
+    robots_ttl: float = 86400  # detik sebelum robots.txt sebuah host diambil ulang
+    checkpoint_interval: float = 60  # detik antar checkpoint, 0 untuk mematikan
+    seen_set: str = 'exact'  # 'exact' (fingerprint 64-bit) atau 'bloom'
+    seen_capacity: int = 10_000_000  # perkiraan jumlah URL, untuk ukuran Bloom filter
+    seen_error_rate: float = 0.001  # peluang false positive Bloom filter
+
+    @property
+    def scrape(self):
+        return self.mode in ('scrape', 'both')
+
+    @property
+    def follow_links(self):
+        return self.mode in ('crawl', 'both')
+
+    def validate(self):
+        """Raise ValueError dengan pesan yang bisa langsung ditampilkan ke pengguna"""
+        if not self.start_url:
+            raise ValueError("Mohon masukkan URL!")
+        if self.mode not in MODES:
+            raise ValueError(f"Mode harus salah satu dari {MODES}")
+        if self.scrape and not self.selectors.strip():
+            raise ValueError("Mohon masukkan CSS Selector untuk scraping!")
+        if self.max_depth < 1:
+            raise ValueError("Kedalaman harus berupa angka positif!")
+        if self.num_workers < 1 or self.delay_min < 0 or self.delay_max < 0:
+            raise ValueError("Jumlah worker dan delay harus berupa angka positif!")
+        if self.fetch_mode not in FETCH_MODES:
+            raise ValueError(f"Mode fetch harus salah satu dari {FETCH_MODES}")
+        if self.seen_set not in SEEN_SET_KINDS:
+            raise ValueError(f"Seen-set harus salah satu dari {SEEN_SET_KINDS}")
+        if self.domain_scope not in SCOPES:
+            raise ValueError(f"Cakupan crawl harus salah satu dari {SCOPES}")
+
+
+def create_indexer(config, schema=None):
+    """Buat BatchIndexer sesuai pengaturan index di config"""
+    return BatchIndexer(
+        config.index_dir,
+        schema or default_schema(config.store_content),
+        batch_size=config.index_batch_size,
+        commit_interval=config.commit_interval,
+        merge_policy=config.merge_policy
+    )
+
+
+def index_results(result_sink, page_store, indexer):
+    """Index hasil scraping dari file sink, satu dokumen per halaman
+
+    Return (jumlah halaman, jumlah item). Tidak ada request jaringan: title
+    dan waktu fetch diambil dari page_store.
+    """
+    page_count = 0
+
+    # Item satu halaman ditulis berurutan, jadi cukup dikelompokkan per URL
+    # sambil membaca file
+    for url, items in itertools.groupby(result_sink.iter_records(), key=lambda item: item['url']):
+        meta = page_store.get(url)
+        indexer.add_document(
+            url=url,
+            title=meta.title if meta else "",
+            content="\n".join(item['content'] for item in items),
+            date=meta.fetched_at if meta else datetime.now()
+        )
+        page_count += 1
+
+    indexer.close()
+    return page_count, result_sink.count
+
+
+class Crawler:
+    """Satu job crawl/scrape/index tanpa ketergantungan ke Tkinter
+
+    Progres dikirim lewat on_event(kind, message) dengan kind 'update',
+    'page' (pesan per halaman), 'error' atau 'finished'. Selector tidak
+    valid atau config salah memunculkan exception di konstruktor, sebelum
+    ada file atau koneksi yang dibuka.
+
+    Selama crawl, state disimpan berkala ke <run_name>.checkpoint.json.gz;
+    crawl yang dihentikan atau mati dilanjutkan dengan Crawler.resume().
+    """
+
+    def __init__(self, config, on_event=None, page_store=None, schema=None, resume_state=None):
+        config.validate()
+        self.config = config
+        self.on_event = on_event or (lambda kind, message: None)
+        self.page_store = page_store if page_store is not None else PageStore()
+        self.schema = schema or default_schema(config.store_content)
+
+        # Backend parser dan selector ditentukan sekali per crawl
+        self.parser_backend = page_parser.resolve_backend(config.parser_backend)
+        self.selectors = None
+        if config.scrape:
+            self.selectors = page_parser.CompiledSelectors(config.selectors, self.parser_backend)
+        # Regex cakupan juga dikompilasi sekali, pola tidak valid langsung ditolak
+        self.scope = ScopeFilter(config.start_url, config.domain_scope, config.include_patterns,
+                                 config.exclude_patterns, config.blocked_extensions)
+
+        self.resume_state = resume_state
+        if resume_state:
+            # Lanjutkan file hasil yang sama dari posisi checkpoint terakhir
+            self.run_name = resume_state['run_name']
+            sink = resume_state['sink']
+            self.result_sink = JsonlSink(sink['path'], batch_size=config.sink_batch_size,
+                                         offset=sink['offset'], count=sink['count'])
+            if resume_state.get('pages'):
+                self.page_store.load_state(resume_state['pages'])
+        else:
+            self.run_name, self.result_sink = self._create_run(config)
+        self.checkpoint_path = self.run_name + CHECKPOINT_SUFFIX
+
+        self.engine = None
+        self.index_worker = None
+        self.http = None
+        self.http_cache = None
+        self.robots = None
+        self.host_scheduler = None
+        self.started_at = None
+        self.stopped = False  # True jika crawl dihentikan sebelum frontier habis
+        self._active = False
+        self._finished = threading.Event()
+
+    @staticmethod
+    def _create_run(config):
+        """Nama run baru yang unik beserta file hasilnya
+
+        Hasil scraping ditulis langsung ke file .jsonl selama crawl berjalan.
+        File dibuat eksklusif: crawl lain yang mulai di waktu yang sama
+        mendapat akhiran _1, _2, dan seterusnya.
+        """
+        base = os.path.join(config.results_dir, f"crawl_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}")
+        for attempt in itertools.count():
+            run_name = base if attempt == 0 else f"{base}_{attempt}"
+            try:
+                return run_name, JsonlSink(run_name + ".jsonl", batch_size=config.sink_batch_size)
+            except FileExistsError:
+                continue
+
+    @classmethod
+    def resume(cls, checkpoint_path, on_event=None, page_store=None, schema=None, **overrides):
+        """Buat Crawler yang melanjutkan crawl dari file checkpoint
+
+        overrides mengganti pengaturan di RESUME_OPTIONS, misalnya max_pages
+        yang lebih besar untuk crawl yang terpotong batas halaman. Pengaturan
+        lain yang berbeda dari checkpoint ditolak dengan ValueError.
+        """
+        state = load_checkpoint(checkpoint_path)
+        # JSON menyimpan tuple sebagai list
+        values = {name: tuple(value) if isinstance(value, list) else value
+                  for name, value in state['config'].items()}
+        for name, value in overrides.items():
+            if name in RESUME_OPTIONS:
+                values[name] = value
+            elif value != values.get(name):
+                raise ValueError(f"Pengaturan {name} tidak bisa diubah saat melanjutkan crawl "
+                                 f"(checkpoint: {values.get(name)!r}, diminta: {value!r})")
+        config = CrawlConfig(**values)
+
+        if config.max_pages and state['engine']['pages_crawled'] >= config.max_pages:
+            raise ValueError(f"Crawl di checkpoint sudah mencapai batas {config.max_pages} halaman, "
+                             f"lanjutkan dengan batas halaman yang lebih besar")
+        return cls(config, on_event=on_event, page_store=page_store, schema=schema, resume_state=state)
+
+    def is_active(self):
+        return self._active
+
+    def stop(self):
+        self.stopped = True
+        self._active = False
+
+    def emit(self, kind, message):
+        self.on_event(kind, message)
+
+    def run(self):
+        """Jalankan crawl sampai selesai atau dihentikan, return jumlah halaman"""
+        config = self.config
+        self._active = not self.stopped
+        self.started_at = time.monotonic()
+
+        # Delay diterapkan per host, bukan sleep global sebelum setiap request
+        self.host_scheduler = HostScheduler(config.delay_min, config.delay_max)
+        # Respons crawl sebelumnya dipakai untuk request kondisional
+        if config.cache_path:
+            try:
+                self.http_cache = HttpCache(config.cache_path)
+            except Exception as e:
+                self.emit("error", f"Cache HTTP tidak bisa dibuka, crawl tanpa cache: {str(e)}\n")
+        # Satu session keep-alive dipakai bersama oleh semua worker
+        self.http = SessionManager(
+            pool_connections=config.pool_connections,
+            pool_maxsize=max(config.pool_maxsize, config.num_workers)
+        )
+        if config.respect_robots:
+            self.robots = self.open_robots_cache()
+        engine_options = dict(
+            follow_links=config.follow_links,
+            is_active=self.is_active,
+            max_pages=config.max_pages,
+            num_workers=config.num_workers,
+            scheduler=self.host_scheduler,
+            on_error=self.on_page_error,
+            seen=create_seen_set(config.seen_set, config.seen_capacity, config.seen_error_rate),
+            url_filter=self.admit_url
+        )
+
+        # Index dibuka sekali untuk seluruh crawl dan ditulis oleh thread indexing sendiri
+        if config.auto_index:
+            self.index_worker = IndexWorker(
+                create_indexer(config, self.schema),
+                max_queue=config.index_queue_size,
+                on_error=lambda url, e: self.emit("error", f"Error saat indexing {url or ''}: {str(e)}\n")
+            ).start()
+
+        fetch_mode = config.fetch_mode
+        if fetch_mode == 'async' and not async_fetcher.is_available():
+            self.emit("error", "Mode async membutuhkan aiohttp, kembali ke mode thread\n")
+            fetch_mode = 'threaded'
+
+        if fetch_mode == 'async':
+            self.engine = async_fetcher.AsyncCrawlEngine(
+                self.process_page,
+                config.max_depth,
+                report=self.emit,
+                headers_factory=get_random_headers,
+                timeout=config.timeout,
+                max_retries=config.max_retries,
+                pool_maxsize=config.pool_maxsize,
+                stats=self.http.stats,
+                http_cache=self.http_cache,
+                on_fetch_failed=self.keep_url,
+                max_body_size=config.max_body_size,
+                **engine_options
+            )
+        else:
+            self.engine = CrawlEngine(self.crawl_page, config.max_depth, **engine_options)
+
+        if self.resume_state:
+            self.engine.restore(self.resume_state['engine'])
+            if self.index_worker:
+                if self.resume_state.get('indexed'):
+                    self.index_worker.indexer.touched.load_state(self.resume_state['indexed'])
+            self.emit("update", f"Melanjutkan crawl: {len(self.engine.frontier)} URL tertunda, "
+                                f"{self.engine.pages_crawled} halaman sudah dikunjungi\n")
+
+        checkpointer = None
+        if config.checkpoint_interval:
+            checkpointer = threading.Thread(target=self._checkpoint_loop, name="checkpoint", daemon=True)
+            checkpointer.start()
+
+        completed = False
+        try:
+            self.engine.run(config.start_url)
+            # Crawl lengkap: tidak dihentikan dan tidak terpotong max_pages
+            completed = not self.stopped and len(self.engine.frontier) == 0
+            self.emit("update", f"\nTotal halaman dikunjungi: {self.engine.pages_crawled}\n")
+            self.emit("update", f"Koneksi: {self.http.stats.summary()}\n")
+            self.emit("update", f"Seen-set: {self.engine.frontier.seen_summary()}\n")
+            self.emit("update", f"Memori: {self.memory_summary()}\n")
+            self.emit("update", f"Cakupan: {self.scope.rejected} URL di luar cakupan tidak diambil\n")
+            if self.http_cache:
+                self.emit("update", f"Cache: {self.http_cache.summary()}\n")
+            if self.robots:
+                self.emit("update", f"Robots.txt: {self.robots.summary()}\n")
+        except Exception as e:
+            self.emit("error", f"Error tidak terduga pada {config.start_url}: {str(e)}\n")
+        finally:
+            self._finished.set()
+            if checkpointer:
+                checkpointer.join()
+            if completed:
+                remove_checkpoint(self.checkpoint_path)
+            elif config.checkpoint_interval:
+                # Crawl dihentikan atau terpotong: simpan posisi terakhir untuk resume
+                if self.save_checkpoint():
+                    if self.reached_max_pages():
+                        self.emit("update", f"Batas {config.max_pages} halaman tercapai, "
+                                            f"{len(self.engine.frontier)} URL belum dikunjungi. Checkpoint "
+                                            f"disimpan, lanjutkan dengan Resume dan batas halaman yang lebih "
+                                            f"besar: {self.checkpoint_path}\n")
+                    else:
+                        self.emit("update", f"Checkpoint disimpan, lanjutkan dengan Resume: {self.checkpoint_path}\n")
+            self.http.close()
+            if self.http_cache:
+                self.http_cache.close()
+            if self.robots:
+                self.robots.close()
+            self.result_sink.close()
+            if self.result_sink.count:
+                self.emit("update", f"Hasil scraping: {self.result_sink.count} item di {self.result_sink.path}\n")
+            if self.index_worker:
+                try:
+                    self.index_worker.stop()
+                    indexer = self.index_worker.indexer
+                    # Dihapus sebelum close(): DocStore masih terbuka dan optimize mencakup penghapusan
+                    if completed and config.follow_links:
+                        self.prune_index(indexer)
+                    indexer.close()
+                    self.emit("update", f"Index: {indexer.summary()}\n")
+                except Exception as e:
+                    self.emit("error", f"Error saat commit index: {str(e)}\n")
+            self.emit("finished", None)
+
+        return self.engine.pages_crawled
+
+    def reached_max_pages(self):
+        """True jika crawl berhenti karena batas max_pages, bukan karena dihentikan"""
+        max_pages = self.config.max_pages
+        return bool(max_pages) and not self.stopped and self.engine.pages_crawled >= max_pages
+
+    def memory_summary(self):
+        """Memori struktur per halaman yang tumbuh selama crawl (seen-set, fingerprint index, page_store)"""
+        total = self.engine.frontier.seen_nbytes
+        if self.index_worker:
+            total += self.index_worker.indexer.nbytes
+        pages = max(1, self.engine.pages_crawled)
+        summary = f"{total / 1024 / 1024:.1f} MB ({total / pages:.0f} byte/halaman)"
+        if self.config.record_pages:
+            summary += f", ditambah {len(self.page_store)} metadata halaman di page_store"
+        return summary
+
+    def prune_index(self, indexer):
+        """Setelah crawl lengkap: catat cakupannya dan hapus dokumen yang hilang jika aman
+
+        Dokumen hanya dihapus jika prune_index aktif dan crawl ini mencakup
+        semua URL yang dicapai crawl lengkap sebelumnya dari URL awal yang sama
+        (kedalaman tidak lebih dangkal, scope dan filter sama). URL yang gagal
+        diambil tetap dianggap ada (lihat keep_url).
+        """
+        config = self.config
+        coverages = load_coverage(config.index_dir)
+        previous = coverages.get(config.start_url)
+        coverage = crawl_coverage(config)
+        safe = previous is not None and covers(coverage, previous)
+
+        if config.prune_index:
+            if safe:
+                indexer.delete_missing(site_prefix(config.start_url))
+            else:
+                self.emit("update", "Index: dokumen lama tidak dihapus, cakupan crawl berbeda dari "
+                                    "crawl lengkap sebelumnya (atau belum ada)\n")
+        # Crawl yang lebih sempit tidak menggantikan acuan dari crawl yang lebih luas
+        if previous is None or safe:
+            coverages[config.start_url] = coverage
+            save_coverage(config.index_dir, coverages)
+
+    def keep_url(self, url):
+        """Halaman yang gagal diambil atau diproses tidak dianggap hilang dari situs"""
+        if self.index_worker:
+            self.index_worker.indexer.keep(url)
+
+    def on_page_error(self, url, error):
+        self.keep_url(url)
+        self.emit("error", f"Error tidak terduga pada {url}: {str(error)}\n")
+
+    def _checkpoint_loop(self):
+        while not self._finished.wait(self.config.checkpoint_interval):
+            self.save_checkpoint()
+
+    def save_checkpoint(self):
+        """Simpan frontier, seen-set, jeda per host, posisi file hasil dan index ke disk
+
+        Worker hanya ditahan selama bagian yang harus konsisten diambil: posisi
+        file .jsonl, URL tertunda, salinan array seen-set dan salinan page_store
+        (jika record_pages, untuk manual index setelah resume). Setiap halaman
+        yang hasilnya sudah ada di file .jsonl juga sudah keluar dari frontier.
+        Commit index dan serialisasi dilakukan setelah worker jalan lagi.
+        Return False jika gagal.
+        """
+        try:
+            with self.engine.paused():
+                offset, count = self.result_sink.checkpoint()
+                engine_state = self.engine.snapshot()
+                pages = self.page_store.copy() if self.config.record_pages else None
+
+            indexed = None
+            if self.index_worker:
+                # Dokumen halaman sebelum snapshot sudah ada di antrian index; tunggu sampai di-commit
+                self.index_worker.sync()
+                indexed = self.index_worker.indexer.touched_snapshot().to_state()
+            engine_state['seen'] = engine_state['seen'].to_state()
+            state = {
+                'run_name': self.run_name,
+                'config': asdict(self.config),
+                'sink': {'path': self.result_sink.path, 'offset': offset, 'count': count},
+                'engine': engine_state,
+                'indexed': indexed,
+                'pages': pages.to_state() if pages is not None else None
+            }
+            save_checkpoint(self.checkpoint_path, state)
+            return True
+        except Exception as e:
+            self.emit("error", f"Gagal menyimpan checkpoint: {str(e)}\n")
+            return False
+
+    def open_robots_cache(self):
+        """RobotsCache yang Crawl-delay-nya diteruskan ke jeda per host"""
+        config = self.config
+        options = dict(ttl=config.robots_ttl, on_crawl_delay=self.host_scheduler.set_min_delay)
+        try:
+            return RobotsCache(self.fetch_robots, path=config.robots_cache_path, **options)
+        except Exception as e:
+            self.emit("error", f"Cache robots.txt tidak bisa dibuka, hanya di memori: {str(e)}\n")
+            return RobotsCache(self.fetch_robots, **options)
+
+    def fetch_robots(self, url):
+        """Ambil robots.txt untuk RobotsCache, return (status, text)"""
+        response = self.http.get(url, headers=get_random_headers(), timeout=self.config.timeout)
+        return response.status_code, response.text
+
+    def admit_url(self, url):
+        """Cek URL sebelum masuk frontier, supaya URL yang ditolak tidak pernah di-fetch"""
+        # URL awal selalu diambil walaupun tidak cocok dengan pola include
+        if url != self.config.start_url and not self.scope.allows(url):
+            return False
+        if self.robots and not self.robots.allowed(url):
+            self.emit("page", f"Dilarang oleh robots.txt: {url}\n")
+            return False
+        return True
+
+    def crawl_page(self, url, depth):
+        """Ambil dan proses satu halaman, return daftar link yang ditemukan"""
+        try:
+            page = self.fetch_page(url)
+            if page is None:
+                self.keep_url(url)
+                return []
+            return self.process_page(url, page, depth)
+        except Exception as e:
+            self.on_page_error(url, e)
+        return []
+
+    def fetch_page(self, url):
+        """Ambil satu halaman dengan retry dan backoff 403, return FetchResult atau None jika gagal"""
+        # Get dengan random headers
+        headers = get_random_headers()
+        # Request kondisional jika halaman sudah ada di cache
+        entry = self.http_cache.get(url) if self.http_cache else None
+        if entry:
+            headers.update(entry.conditional_headers())
+
+        # Coba beberapa kali jika gagal
+        retries = self.config.max_retries
+        for attempt in range(retries):
+            try:
+                # Stream: header dicek dulu, body hanya diunduh untuk HTML dalam batas ukuran
+                with self.http.get(url, headers=headers, timeout=self.config.timeout, stream=True) as response:
+                    # Cek jika diblokir
+                    if response.status_code == 403:
+                        self.emit("error", f"Terdeteksi sebagai bot di {url}, mencoba lagi...\n")
+                        # Tunggu lebih lama, lalu antre lagi di slot host yang sama
+                        if not self.host_scheduler.backoff(url, self.is_active):
+                            return None
+                        continue
+
+                    if response.status_code == 304 and entry:
+                        self.http_cache.record_not_modified()
+                        return FetchResult(url, 304, None, entry.etag, entry.last_modified, entry)
+
+                    response.raise_for_status()
+                    return FetchResult(url, response.status_code,
+                                       read_text(response, self.config.max_body_size),
+                                       response.headers.get('ETag'),
+                                       response.headers.get('Last-Modified'),
+                                       entry)
+
+            except ResponseSkipped as e:
+                self.http.stats.record_skipped()
+                self.emit("page", f"Dilewati {url}: {str(e)}\n")
+                return None
+            except requests.exceptions.ConnectionError:
+                if attempt == retries - 1:  # Jika ini percobaan terakhir
+                    self.emit("error", f"Koneksi gagal ke {url} setelah {retries} percobaan\n")
+            except Exception as e:
+                if attempt == retries - 1:  # Jika ini percobaan terakhir
+                    self.emit("error", f"Error pada {url}: {str(e)}\n")
+        return None
+
+    def process_page(self, url, page, depth):
+        """Parse, index dan scrape HTML satu halaman, return daftar link yang ditemukan"""
+        links = []
+        parsed = self.parse_page(url, page)
+        if parsed is None:
+            self.keep_url(url)
+            return links
+        result, digest = parsed
+
+        # Simpan metadata supaya manual index tidak perlu fetch ulang; hanya jika diminta,
+        # karena page_store menyimpan satu objek per halaman di memori
+        if self.config.record_pages:
+            self.page_store.record(url, title=result.title, status=page.status_code, digest=digest)
+
+        # Index konten jika mode auto; menunggu jika antrian index penuh
+        if self.index_worker:
+            self.index_worker.submit(
+                is_active=self.is_active,
+                url=url,
+                title=result.title,
+                content=result.index_text,
+                date=datetime.now()
+            )
+
+        self.emit("page", f"Mengunjungi: {url}\n")
+
+        # Melakukan scraping jika mode sesuai
+        if self.selectors:
+            scraped_content = [
+                {'url': url, 'selector': selector, 'content': text}
+                for selector, text in result.matches
+                if text
+            ]
+
+            if scraped_content:
+                self.result_sink.write_many(scraped_content)
+                self.emit("page", f"Berhasil scraping {len(scraped_content)} elemen dari {url}\n")
+
+        # Kumpulkan link untuk frontier jika mode sesuai
+        for href in result.hrefs:
+            try:
+                # Perbaikan penanganan URL relatif
+                links.append(urljoin(url, href))
+            except Exception as e:
+                self.emit("error", f"Error parsing URL {href}: {str(e)}\n")
+
+        return links
+
+    def parse_key(self):
+        """Identitas pengaturan parse; hasil parse di cache hanya dipakai jika sama"""
+        selectors = ",".join(self.selectors.selectors) if self.selectors else ""
+        return f"{self.parser_backend}|{int(self.index_worker is not None)}|{int(self.config.follow_links)}|{selectors}"
+
+    def parse_page(self, url, page):
+        """Parse halaman atau pakai hasil parse dari cache, return (PageResult, hash konten) atau None
+
+        Respons 304, atau respons 200 dengan isi yang hash-nya sama, tidak di-parse
+        ulang selama pengaturan parse tidak berubah.
+        """
+        entry = page.cache_entry
+        html = page.text
+        digest = entry.content_hash if html is None else content_hash(html)
+        parse_key = self.parse_key()
+
+        if entry and entry.result and entry.content_hash == digest and entry.parse_key == parse_key:
+            self.http_cache.record_parse_reused()
+            if page.status_code != 304 and (page.etag, page.last_modified) != (entry.etag, entry.last_modified):
+                # Isi sama tapi validator baru: simpan supaya request berikutnya bisa 304
+                self.http_cache.store(url, digest, parse_key, entry.result,
+                                      etag=page.etag, last_modified=page.last_modified)
+            return entry.result, digest
+
+        if html is None:
+            html = self.http_cache.body(url)
+            if html is None:
+                self.emit("error", f"Cache untuk {url} tidak lengkap, halaman dilewati\n")
+                return None
+
+        # Satu kali jalan di tree untuk title, teks index, link dan selector
+        result = page_parser.extract_page(
+            html,
+            self.parser_backend,
+            selectors=self.selectors,
+            want_index=self.index_worker is not None,
+            want_links=self.config.follow_links
+        )
+
+        if self.http_cache:
+            self.http_cache.store(url, digest, parse_key, result,
+                                  etag=page.etag, last_modified=page.last_modified,
+                                  body=page.text, not_modified=page.status_code == 304)
+        return result, digest
+
+    def stats(self):
+        """Ringkasan statistik crawl yang sedang berjalan"""
+        engine = self.engine
+        if engine is None or self.started_at is None:
+            return None
+        elapsed = max(time.monotonic() - self.started_at, 0.001)
+        return {
+            'pages': engine.pages_crawled,
+            'pages_per_second': engine.pages_crawled / elapsed,
+            'frontier': len(engine.frontier),
+            'index_pending': self.index_worker.pending if self.index_worker else 0
+        }
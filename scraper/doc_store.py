@@ -0,0 +1,54 @@
+"""Penyimpanan teks halaman terkompresi di luar index Whoosh
+
+Dipakai jika field content di-index tanpa disimpan (schema ramping): teks
+lengkap hanya dibutuhkan untuk highlight hasil pencarian, jadi cukup
+disimpan sekali dalam bentuk zlib alih-alih sebagai stored field Whoosh.
+"""
+import os
+import sqlite3
+import threading
+import zlib
+
+# Nama file di dalam folder index
+DOC_STORE_NAME = 'documents.sqlite'
+
+
+def doc_store_path(index_dir):
+    return os.path.join(index_dir, DOC_STORE_NAME)
+
+
+class DocStore:
+    """Tabel SQLite url -> teks (zlib), aman dipakai banyak thread"""
+
+    def __init__(self, path, level=6):
+        self.path = path
+        self.level = level
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS documents (url TEXT PRIMARY KEY, content BLOB NOT NULL)")
+        self._db.commit()
+
+    def put_many(self, documents):
+        """Simpan [(url, text), ...] dalam satu transaksi"""
+        rows = [(url, zlib.compress((text or '').encode('utf-8'), self.level)) for url, text in documents]
+        with self._lock:
+            self._db.executemany("INSERT OR REPLACE INTO documents (url, content) VALUES (?, ?)", rows)
+            self._db.commit()
+
+    def delete_many(self, urls):
+        with self._lock:
+            self._db.executemany("DELETE FROM documents WHERE url = ?", [(url,) for url in urls])
+            self._db.commit()
+
+    def get(self, url):
+        """Teks untuk url, atau None jika tidak ada"""
+        with self._lock:
+            row = self._db.execute("SELECT content FROM documents WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        return zlib.decompress(row[0]).decode('utf-8')
+
+    def close(self):
+        with self._lock:
+            self._db.close()
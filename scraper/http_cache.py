@@ -0,0 +1,153 @@
+"""Cache respons HTTP di disk untuk request kondisional (ETag / Last-Modified)"""
+import json
+import sqlite3
+import threading
+import time
+import zlib
+
+from crawl_engine import normalize_url
+from page_parser import PageResult
+
+
+class CacheEntry:
+    """Validator, hash konten dan hasil parse satu URL dari crawl sebelumnya
+
+    Body tidak ikut dimuat; ambil lewat HttpCache.body() jika memang perlu
+    di-parse ulang.
+    """
+
+    __slots__ = ('url', 'etag', 'last_modified', 'content_hash', 'parse_key', 'result')
+
+    def __init__(self, url, etag, last_modified, content_hash, parse_key, result):
+        self.url = url
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content_hash = content_hash
+        self.parse_key = parse_key
+        self.result = result
+
+    def conditional_headers(self):
+        """Header If-None-Match / If-Modified-Since untuk re-crawl"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+def _encode_result(result):
+    return json.dumps([result.title, result.index_text, result.hrefs, result.matches], ensure_ascii=False)
+
+
+def _decode_result(data):
+    if not data:
+        return None
+    title, index_text, hrefs, matches = json.loads(data)
+    return PageResult(title, index_text, hrefs, [tuple(match) for match in matches])
+
+
+class HttpCache:
+    """Cache SQLite berkunci URL ternormalisasi, aman dipakai banyak worker
+
+    Menyimpan validator, body (dikompres zlib), hash konten dan hasil parse
+    terakhir. Tulisan di-commit per commit_every entri dan saat close().
+    """
+
+    def __init__(self, path, commit_every=50):
+        self.path = path
+        self.commit_every = commit_every
+        self.not_modified = 0
+        self.parse_reused = 0
+
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT NOT NULL,
+                body BLOB,
+                parse_key TEXT,
+                result TEXT,
+                fetched_at REAL
+            )
+        """)
+        self._db.commit()
+
+    def get(self, url):
+        """CacheEntry untuk url, atau None jika belum pernah disimpan"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT url, etag, last_modified, content_hash, parse_key, result "
+                "FROM responses WHERE key = ?", (normalize_url(url),)
+            ).fetchone()
+        if row is None:
+            return None
+        url, etag, last_modified, digest, parse_key, result = row
+        return CacheEntry(url, etag, last_modified, digest, parse_key, _decode_result(result))
+
+    def body(self, url):
+        """Body HTML tersimpan untuk url, atau None"""
+        with self._lock:
+            row = self._db.execute("SELECT body FROM responses WHERE key = ?",
+                                   (normalize_url(url),)).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return zlib.decompress(row[0]).decode('utf-8')
+
+    def store(self, url, content_hash, parse_key, result, etag=None, last_modified=None, body=None,
+              not_modified=False):
+        """Simpan atau perbarui entri; body=None mempertahankan body yang sudah ada
+
+        Validator dari respons 200 selalu menggantikan yang lama, termasuk jika
+        kosong, supaya request berikutnya tidak mengirim validator basi.
+        not_modified=True (respons 304) mempertahankan validator lama yang
+        tidak dikirim ulang server.
+        """
+        blob = zlib.compress(body.encode('utf-8')) if body is not None else None
+        if not_modified:
+            etag_value = "COALESCE(excluded.etag, etag)"
+            last_modified_value = "COALESCE(excluded.last_modified, last_modified)"
+        else:
+            etag_value, last_modified_value = "excluded.etag", "excluded.last_modified"
+        with self._lock:
+            self._db.execute(f"""
+                INSERT INTO responses (key, url, etag, last_modified, content_hash, body,
+                                       parse_key, result, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    url = excluded.url,
+                    etag = {etag_value},
+                    last_modified = {last_modified_value},
+                    content_hash = excluded.content_hash,
+                    body = COALESCE(excluded.body, body),
+                    parse_key = excluded.parse_key,
+                    result = excluded.result,
+                    fetched_at = excluded.fetched_at
+            """, (normalize_url(url), url, etag, last_modified, content_hash, blob,
+                  parse_key, _encode_result(result), time.time()))
+            self._pending += 1
+            if self._pending >= self.commit_every:
+                self._db.commit()
+                self._pending = 0
+
+    def record_not_modified(self):
+        with self._lock:
+            self.not_modified += 1
+
+    def record_parse_reused(self):
+        with self._lock:
+            self.parse_reused += 1
+
+    def summary(self):
+        return f"{self.not_modified} halaman tidak berubah (304), {self.parse_reused} hasil parse dipakai ulang"
+
+    def close(self):
+        with self._lock:
+            self._db.commit()
+            self._db.close()
@@ -0,0 +1,158 @@
+"""Lapisan session HTTP keep-alive dengan connection pool per host"""
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+# Content-Type yang di-parse; respons tanpa Content-Type tetap dicoba
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+
+class ResponseSkipped(Exception):
+    """Respons sengaja tidak diunduh penuh: bukan HTML atau melebihi batas ukuran"""
+
+
+def check_response_headers(headers, max_bytes=None):
+    """Raise ResponseSkipped berdasarkan header saja, sebelum body diunduh"""
+    mimetype = (headers.get('Content-Type') or '').split(';', 1)[0].strip().lower()
+    if mimetype and mimetype not in HTML_CONTENT_TYPES:
+        raise ResponseSkipped(f"Content-Type {mimetype}")
+    length = headers.get('Content-Length') or ''
+    if max_bytes and length.isdigit() and int(length) > max_bytes:
+        raise ResponseSkipped(f"ukuran {int(length)} byte melebihi batas {max_bytes} byte")
+
+
+def decode_body(body, encoding=None):
+    try:
+        return body.decode(encoding or 'utf-8', errors='replace')
+    except LookupError:
+        return body.decode('utf-8', errors='replace')
+
+
+def read_text(response, max_bytes=None, chunk_size=65536):
+    """Body respons requests (stream=True) sebagai text, berhenti begitu melebihi max_bytes
+
+    Header dicek lebih dulu, jadi respons non-HTML atau yang Content-Length-nya
+    terlalu besar tidak diunduh sama sekali.
+    """
+    check_response_headers(response.headers, max_bytes)
+    chunks = []
+    size = 0
+    for chunk in response.iter_content(chunk_size):
+        size += len(chunk)
+        if max_bytes and size > max_bytes:
+            raise ResponseSkipped(f"body melebihi batas {max_bytes} byte")
+        chunks.append(chunk)
+    return decode_body(b''.join(chunks), response.encoding)
+
+
+class ConnectionStats:
+    """Penghitung request dan koneksi baru untuk mengukur connection reuse"""
+
+    def __init__(self):
+        self.requests = 0
+        self.new_connections = 0
+        self.skipped = 0  # respons non-HTML atau terlalu besar yang tidak diunduh penuh
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_new_connection(self):
+        with self._lock:
+            self.new_connections += 1
+
+    def record_skipped(self):
+        with self._lock:
+            self.skipped += 1
+
+    @property
+    def reused(self):
+        return max(0, self.requests - self.new_connections)
+
+    def summary(self):
+        summary = (f"{self.requests} request, {self.new_connections} koneksi baru, "
+                   f"{self.reused} koneksi dipakai ulang")
+        if self.skipped:
+            summary += f", {self.skipped} respons dilewati (bukan HTML / terlalu besar)"
+        return summary
+
+
+def _counting_pool_class(base, stats):
+    """Subclass connection pool urllib3 yang mencatat setiap koneksi baru"""
+
+    class CountingConnectionPool(base):
+        def _new_conn(self):
+            stats.record_new_connection()
+            return super()._new_conn()
+
+    return CountingConnectionPool
+
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter dengan pool per host dan statistik connection reuse"""
+
+    def __init__(self, stats, **kwargs):
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _counting_pool_class(HTTPConnectionPool, self.stats),
+            'https': _counting_pool_class(HTTPSConnectionPool, self.stats),
+        }
+
+    def send(self, request, **kwargs):
+        self.stats.record_request()
+        return super().send(request, **kwargs)
+
+
+class SessionManager:
+    """Satu requests.Session yang dipakai bersama oleh semua worker fetch
+
+    pool_connections adalah jumlah host yang pool-nya disimpan, pool_maxsize
+    adalah jumlah koneksi keep-alive per host (sebaiknya >= jumlah worker).
+    """
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, verify=False):
+        self.stats = ConnectionStats()
+        self.session = requests.Session()
+        self.session.verify = verify
+
+        adapter = PooledAdapter(self.stats,
+                                pool_connections=pool_connections,
+                                pool_maxsize=pool_maxsize)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def get(self, url, **kwargs):
+        return self.session.get(url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def aiohttp_trace_config(stats):
+    """TraceConfig aiohttp yang mengisi ConnectionStats yang sama dengan mode thread"""
+    import aiohttp
+
+    async def on_request_start(session, context, params):
+        stats.record_request()
+
+    async def on_connection_create_end(session, context, params):
+        stats.record_new_connection()
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    return trace_config
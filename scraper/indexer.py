@@ -0,0 +1,324 @@
+"""Tahap indexing Whoosh: index dibuka sekali dan dokumen di-commit per batch"""
+import os
+import queue
+import threading
+import time
+
+from whoosh import index
+
+from doc_store import DocStore, doc_store_path
+from page_store import content_hash
+from url_seen import FingerprintMap, FingerprintSet
+
+# auto: gabungkan segmen kecil di setiap commit (default Whoosh)
+# none: tidak pernah merge otomatis, panggil optimize() secara eksplisit
+# optimize: tidak merge selama crawl, lalu optimize penuh saat close()
+MERGE_POLICIES = ('auto', 'none', 'optimize')
+
+
+def open_or_create_index(index_dir, schema):
+    """Buka index yang ada atau buat index baru dengan schema yang diberikan
+
+    Field schema yang belum ada di index lama (misalnya fingerprint) ditambahkan.
+    """
+    if not index.exists_in(index_dir):
+        os.makedirs(index_dir, exist_ok=True)
+        return index.create_in(index_dir, schema)
+
+    ix = index.open_dir(index_dir)
+    missing = [name for name in schema.names() if name not in ix.schema]
+    if missing:
+        writer = ix.writer(timeout=10.0)
+        for name in missing:
+            writer.add_field(name, schema[name])
+        writer.commit()
+    return ix
+
+
+def uses_doc_store(schema):
+    """True jika content di-index tanpa disimpan, sehingga teksnya ada di DocStore"""
+    return 'content' in schema and not schema['content'].stored
+
+
+def document_fingerprint(fields):
+    """Hash title dan content dokumen, untuk mendeteksi halaman yang tidak berubah"""
+    return content_hash(f"{fields.get('title') or ''}\0{fields.get('content') or ''}")
+
+
+def _fingerprint_value(fingerprint):
+    """Fingerprint dokumen (hex) sebagai nilai FingerprintMap; 1 untuk dokumen lama tanpa fingerprint"""
+    if not fingerprint:
+        return 1
+    return int(fingerprint[:15], 16) + 2
+
+
+class BatchIndexer:
+    """Penulis index berumur panjang yang menampung dokumen dan commit per batch
+
+    Commit terjadi jika buffer mencapai batch_size atau commit terakhir sudah
+    lebih lama dari commit_interval detik, sehingga satu crawl tidak lagi
+    menghasilkan satu segmen per halaman.
+
+    url adalah kunci dokumen: halaman yang fingerprint-nya sama dengan yang
+    sudah ada di index dilewati, halaman yang berubah menggantikan dokumen lama.
+
+    Jika content di index tidak disimpan (schema ramping), teks lengkap ditulis
+    terkompresi ke DocStore di folder index untuk keperluan highlight.
+    """
+
+    def __init__(self, index_dir, schema, batch_size=100, commit_interval=5.0, merge_policy='auto'):
+        if merge_policy not in MERGE_POLICIES:
+            raise ValueError(f"merge_policy harus salah satu dari {MERGE_POLICIES}")
+
+        self.ix = open_or_create_index(index_dir, schema)
+        # Mengikuti schema index yang sudah ada, bukan schema yang diminta
+        self.doc_store = DocStore(doc_store_path(index_dir)) if uses_doc_store(self.ix.schema) else None
+        self.batch_size = batch_size
+        self.commit_interval = commit_interval
+        self.merge_policy = merge_policy
+
+        self.documents_indexed = 0
+        self.documents_skipped = 0
+        self.documents_deleted = 0
+        self.commits = 0
+
+        # url -> fingerprint dokumen di index, dan URL yang dikirim sejak indexer dibuka;
+        # keduanya hanya menyimpan fingerprint 64-bit, bukan string URL
+        self.fingerprints = self._load_fingerprints()
+        self.touched = FingerprintSet()
+
+        self._buffer = []
+        self._buffer_lock = threading.Lock()
+        self._writer_lock = threading.Lock()
+        self._last_commit = time.monotonic()
+
+    def _load_fingerprints(self):
+        fingerprints = FingerprintMap(max(1024, self.ix.doc_count()))
+        with self.ix.searcher() as searcher:
+            for fields in searcher.all_stored_fields():
+                if 'url' in fields:
+                    fingerprints.put(fields['url'], _fingerprint_value(fields.get('fingerprint')))
+        return fingerprints
+
+    def add_document(self, **fields):
+        """Tambah atau ganti dokumen untuk fields['url'], lewati jika isinya tidak berubah"""
+        url = fields['url']
+        fields['fingerprint'] = document_fingerprint(fields)
+        value = _fingerprint_value(fields['fingerprint'])
+        with self._buffer_lock:
+            self.touched.add(url)
+            if self.fingerprints.get(url) == value:
+                self.documents_skipped += 1
+                return
+            self._buffer.append(fields)
+        if self.should_flush():
+            self.flush()
+
+    def keep(self, url):
+        """Anggap url masih ada tanpa mengubah dokumennya, supaya tidak dihapus delete_missing()"""
+        with self._buffer_lock:
+            self.touched.add(url)
+
+    def should_flush(self):
+        with self._buffer_lock:
+            if not self._buffer:
+                return False
+            return (len(self._buffer) >= self.batch_size or
+                    time.monotonic() - self._last_commit >= self.commit_interval)
+
+    def flush(self):
+        """Tulis semua dokumen di buffer dalam satu commit"""
+        with self._writer_lock:
+            with self._buffer_lock:
+                docs, self._buffer = self._buffer, []
+                self._last_commit = time.monotonic()
+            if not docs:
+                return 0
+            # URL yang sama dua kali di satu batch: hanya versi terakhir yang ditulis
+            docs = list({doc['url']: doc for doc in docs}.values())
+
+            if self.doc_store:
+                self.doc_store.put_many([(doc['url'], doc.get('content')) for doc in docs])
+            writer = self.ix.writer(timeout=10.0)
+            try:
+                for doc in docs:
+                    # Setara update_document, tapi juga membersihkan duplikat di
+                    # index lama yang field url-nya belum unique
+                    writer.delete_by_term('url', doc['url'])
+                    writer.add_document(**doc)
+            except Exception:
+                writer.cancel()
+                raise
+            writer.commit(merge=self.merge_policy == 'auto')
+
+            # Fingerprint baru dicatat setelah commit berhasil; jika commit gagal,
+            # halaman tidak dianggap "tidak berubah" dan di-index lagi berikutnya
+            with self._buffer_lock:
+                for doc in docs:
+                    self.fingerprints.put(doc['url'], _fingerprint_value(doc['fingerprint']))
+            self.documents_indexed += len(docs)
+            self.commits += 1
+            return len(docs)
+
+    def delete_missing(self, prefix):
+        """Hapus dokumen ber-URL awalan prefix yang tidak dikirim lagi sejak indexer dibuka
+
+        Dipanggil setelah crawl lengkap selesai: halaman yang tidak lagi
+        ditemukan di situs dianggap sudah hilang.
+        """
+        self.flush()
+        with self._writer_lock:
+            # URL dokumen dibaca dari daftar term field url, tanpa memuat stored field
+            with self.ix.searcher() as searcher, self._buffer_lock:
+                stale = [url for url in (term.decode('utf-8') for term in searcher.lexicon('url'))
+                         if url.startswith(prefix) and url not in self.touched
+                         and self.fingerprints.get(url) is not None]
+            if not stale:
+                return 0
+
+            writer = self.ix.writer(timeout=10.0)
+            try:
+                for url in stale:
+                    writer.delete_by_term('url', url)
+            except Exception:
+                writer.cancel()
+                raise
+            writer.commit(merge=self.merge_policy == 'auto')
+            if self.doc_store:
+                self.doc_store.delete_many(stale)
+
+            with self._buffer_lock:
+                for url in stale:
+                    self.fingerprints.discard(url)
+            self.documents_deleted += len(stale)
+            self.commits += 1
+            return len(stale)
+
+    def touched_snapshot(self):
+        """Salinan touched untuk checkpoint"""
+        with self._buffer_lock:
+            return self.touched.copy()
+
+    @property
+    def nbytes(self):
+        """Memori fingerprint dan touched, untuk laporan memori per halaman"""
+        return self.fingerprints.nbytes + self.touched.nbytes
+
+    def summary(self):
+        return (f"{self.documents_indexed} dokumen dalam {self.commits} commit, "
+                f"{self.documents_skipped} tidak berubah, {self.documents_deleted} dihapus")
+
+    def optimize(self):
+        """Gabungkan semua segmen index menjadi satu"""
+        with self._writer_lock:
+            self.ix.optimize()
+
+    def close(self):
+        self.flush()
+        if self.merge_policy == 'optimize':
+            self.optimize()
+        if self.doc_store:
+            self.doc_store.close()
+            self.doc_store = None
+
+
+_STOP = object()
+
+
+class IndexWorker:
+    """Thread indexing terpisah yang menguras antrian dokumen berukuran terbatas
+
+    Crawler hanya memanggil submit(); jika indexing tertinggal dan antrian
+    penuh, submit() menunggu sehingga crawler ikut melambat (backpressure)
+    alih-alih menumpuk dokumen di memori.
+    """
+
+    def __init__(self, indexer, max_queue=1000, on_error=None):
+        self.indexer = indexer
+        self.on_error = on_error
+        self.queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="index-worker", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def submit(self, is_active=None, **fields):
+        """Masukkan dokumen ke antrian, return False jika crawl dihentikan saat menunggu"""
+        while True:
+            try:
+                self.queue.put(fields, timeout=0.2)
+                return True
+            except queue.Full:
+                if is_active and not is_active():
+                    return False
+
+    @property
+    def pending(self):
+        return self.queue.qsize()
+
+    def _run(self):
+        while True:
+            try:
+                doc = self.queue.get(timeout=0.5)
+            except queue.Empty:
+                # Commit berbasis waktu tetap jalan walaupun tidak ada dokumen baru
+                self._flush_if_due()
+                continue
+
+            try:
+                if doc is _STOP:
+                    break
+                if isinstance(doc, threading.Event):
+                    # Penanda dari sync(): semua dokumen sebelum penanda ini di-commit
+                    self._flush_for_sync(doc)
+                    continue
+                self.indexer.add_document(**doc)
+            except Exception as e:
+                self._report(doc.get('url'), e)
+            finally:
+                self.queue.task_done()
+
+    def _flush_if_due(self):
+        try:
+            if self.indexer.should_flush():
+                self.indexer.flush()
+        except Exception as e:
+            self._report(None, e)
+
+    def _report(self, url, error):
+        if self.on_error:
+            self.on_error(url, error)
+
+    def _flush_for_sync(self, done):
+        try:
+            self.indexer.flush()
+        except Exception as e:
+            self._report(None, e)
+        finally:
+            done.set()
+
+    def sync(self):
+        """Tunggu dokumen yang di-submit sebelum pemanggilan ini di-commit (untuk checkpoint)
+
+        Dokumen yang di-submit setelahnya tidak ditunggu, jadi crawl boleh
+        terus berjalan selama sync.
+        """
+        if not self._thread.is_alive():
+            self.indexer.flush()
+            return
+        done = threading.Event()
+        self.queue.put(done)
+        done.wait()
+
+    def stop(self):
+        """Tunggu antrian habis dan hentikan thread; indexer tetap terbuka (misalnya untuk delete_missing)"""
+        if self._thread.is_alive():
+            self.queue.put(_STOP)
+            self._thread.join()
+        self.indexer.flush()
+
+    def close(self):
+        """Tunggu antrian habis, lalu commit dokumen terakhir dan tutup indexer"""
+        self.stop()
+        self.indexer.close()
@@ -0,0 +1,196 @@
+"""Lapisan parsing HTML dengan backend yang bisa dipilih
+
+bs4, soupsieve dan lxml baru di-import saat pertama dipakai, sehingga modul
+ini murah di-import saat GUI startup.
+"""
+import importlib.util
+
+# auto: BeautifulSoup + lxml jika tersedia, selain itu html.parser
+# lxml: BeautifulSoup dengan tree builder lxml
+# lxml-direct: tree lxml langsung + CSS selector cssselect, tanpa tree BeautifulSoup
+# html.parser: BeautifulSoup dengan parser pure-Python bawaan
+PARSER_BACKENDS = ('auto', 'lxml', 'lxml-direct', 'html.parser')
+
+INDEX_TAGS = ('p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+
+# Teks di dalam tag ini tidak ikut get_text() BeautifulSoup, lxml-direct mengikutinya
+_NON_TEXT_TAGS = ('script', 'style', 'template')
+
+
+def _module_available(name):
+    """Cek modul terinstal tanpa meng-import-nya"""
+    return importlib.util.find_spec(name) is not None
+
+
+def resolve_backend(name):
+    """Tentukan backend yang benar-benar dipakai, turun ke backend lain jika lxml tidak ada"""
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"Parser backend harus salah satu dari {PARSER_BACKENDS}")
+
+    has_lxml = _module_available('lxml')
+    if name == 'lxml-direct' and not (has_lxml and _module_available('cssselect')):
+        name = 'lxml'
+    if name in ('auto', 'lxml'):
+        name = 'lxml' if has_lxml else 'html.parser'
+    return name
+
+
+class PageResult:
+    """Hasil ekstraksi satu halaman: title, teks index, href keluar dan hasil selector"""
+
+    __slots__ = ('title', 'index_text', 'hrefs', 'matches')
+
+    def __init__(self, title, index_text, hrefs, matches):
+        self.title = title
+        self.index_text = index_text
+        self.hrefs = hrefs
+        # Daftar (selector, teks) berurutan per selector seperti soup.select()
+        self.matches = matches
+
+
+class CompiledSelectors:
+    """Selector CSS yang di-parse dan dikompilasi sekali per crawl
+
+    Untuk backend BeautifulSoup dipakai soupsieve.compile(), untuk lxml-direct
+    CSSSelector (XPath terkompilasi). Selector tidak valid langsung memunculkan
+    ValueError saat crawl dimulai, bukan error di setiap halaman.
+    """
+
+    def __init__(self, selector_text, backend):
+        self.selectors = [selector.strip() for selector in selector_text.split(',') if selector.strip()]
+        if backend == 'lxml-direct':
+            from cssselect import SelectorError
+            from lxml.cssselect import CSSSelector
+            compile_selector, errors = CSSSelector, SelectorError
+        else:
+            import soupsieve
+            compile_selector, errors = soupsieve.compile, soupsieve.SelectorSyntaxError
+
+        self.matchers = []
+        for selector in self.selectors:
+            try:
+                self.matchers.append(compile_selector(selector))
+            except errors as e:
+                raise ValueError(f"CSS Selector tidak valid: {selector}\n{e}") from e
+
+    def __len__(self):
+        return len(self.selectors)
+
+
+def extract_page(html, backend, selectors=None, want_index=True, want_links=True):
+    """Parse HTML lalu ambil semua data halaman dalam satu kali jalan
+
+    selectors adalah CompiledSelectors yang dibuat dengan backend yang sama.
+    """
+    if backend == 'lxml-direct':
+        document = LxmlDocument(html)
+    else:
+        document = SoupDocument(html, backend)
+    return document.extract(selectors, want_index, want_links)
+
+
+def _collect_matches(selectors, per_selector):
+    if not selectors:
+        return []
+    return [(selector, text)
+            for selector, texts in zip(selectors.selectors, per_selector)
+            for text in texts]
+
+
+class SoupDocument:
+    """Dokumen BeautifulSoup (tree builder lxml atau html.parser)"""
+
+    def __init__(self, html, features):
+        from bs4 import BeautifulSoup
+        self.soup = BeautifulSoup(html, features)
+
+    def extract(self, selectors, want_index, want_links):
+        """Satu kali jalan di tree: title, teks p/h1-h6, href dan selector sekaligus"""
+        from bs4 import Tag
+        compiled = selectors.matchers if selectors else []
+        per_selector = [[] for _ in compiled]
+        title = None
+        index_parts = []
+        hrefs = []
+
+        for node in self.soup.descendants:
+            if not isinstance(node, Tag):
+                continue
+
+            name = node.name
+            if name == 'title' and title is None:
+                title = node.string or ""
+            elif name == 'a' and want_links:
+                href = node.get('href')
+                if href:
+                    hrefs.append(href)
+            if want_index and name in INDEX_TAGS:
+                index_parts.append(node.get_text(strip=True))
+
+            for matcher, texts in zip(compiled, per_selector):
+                if matcher.match(node):
+                    texts.append(node.get_text(strip=True))
+
+        return PageResult(title or "", " ".join(index_parts), hrefs,
+                          _collect_matches(selectors, per_selector))
+
+
+def _element_text(element):
+    """Setara get_text(strip=True) BeautifulSoup untuk elemen lxml"""
+    parts = []
+    for node in element.iter():
+        # Komentar dan processing instruction punya tag non-string
+        if isinstance(node.tag, str) and node.tag not in _NON_TEXT_TAGS and node.text:
+            text = node.text.strip()
+            if text:
+                parts.append(text)
+        if node is not element and node.tail:
+            tail = node.tail.strip()
+            if tail:
+                parts.append(tail)
+    return "".join(parts)
+
+
+class LxmlDocument:
+    """Dokumen lxml langsung; selector CSS diterjemahkan ke XPath oleh cssselect"""
+
+    def __init__(self, html):
+        import lxml.html
+        parser = lxml.html.HTMLParser(encoding='utf-8')
+        try:
+            # Encode dulu: lxml menolak string unicode yang punya deklarasi encoding
+            self.root = lxml.html.document_fromstring(html.encode('utf-8'), parser=parser)
+        except lxml.etree.ParserError:
+            # Dokumen kosong
+            self.root = lxml.html.document_fromstring(b"<html></html>", parser=parser)
+
+    def extract(self, selectors, want_index, want_links):
+        """Satu kali jalan di tree untuk title, teks dan href
+
+        Selector CSS dievaluasi sebagai XPath terkompilasi di dalam libxml2,
+        jauh lebih murah daripada mencocokkan setiap elemen dari Python.
+        """
+        title = None
+        index_parts = []
+        hrefs = []
+
+        for element in self.root.iter():
+            tag = element.tag
+            if not isinstance(tag, str):
+                continue
+
+            if tag == 'title' and title is None:
+                title = element.text or ""
+            elif tag == 'a' and want_links:
+                href = element.get('href')
+                if href:
+                    hrefs.append(href)
+            if want_index and tag in INDEX_TAGS:
+                index_parts.append(_element_text(element))
+
+        matchers = selectors.matchers if selectors else []
+        per_selector = [[_element_text(element) for element in matcher(self.root)]
+                        for matcher in matchers]
+
+        return PageResult(title or "", " ".join(index_parts), hrefs,
+                          _collect_matches(selectors, per_selector))
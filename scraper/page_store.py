@@ -0,0 +1,72 @@
+"""Penyimpanan metadata halaman hasil crawl, dikunci per URL"""
+import hashlib
+import threading
+from datetime import datetime
+
+
+def content_hash(text):
+    """Hash SHA-1 dari isi halaman untuk mendeteksi perubahan konten"""
+    return hashlib.sha1(text.encode('utf-8', errors='replace')).hexdigest()
+
+
+class PageMeta:
+    """Metadata satu halaman: title, waktu fetch, status HTTP dan hash konten"""
+
+    __slots__ = ('url', 'title', 'fetched_at', 'status', 'content_hash')
+
+    def __init__(self, url, title, fetched_at, status, content_hash):
+        self.url = url
+        self.title = title
+        self.fetched_at = fetched_at
+        self.status = status
+        self.content_hash = content_hash
+
+
+class PageStore:
+    """Peta URL -> PageMeta yang diisi selama crawl dan aman dipakai banyak worker"""
+
+    def __init__(self):
+        self._pages = {}
+        self._lock = threading.Lock()
+
+    def record(self, url, title, status, html=None, digest=None):
+        """Catat metadata halaman; digest bisa diberikan jika hash isi sudah dihitung"""
+        if digest is None:
+            if html is None:
+                raise ValueError("record() membutuhkan html atau digest")
+            digest = content_hash(html)
+        meta = PageMeta(url, title or "", datetime.now(), status, digest)
+        with self._lock:
+            self._pages[url] = meta
+        return meta
+
+    def copy(self):
+        """Salinan untuk checkpoint; PageMeta tidak diubah setelah dicatat, jadi cukup salin petanya"""
+        clone = PageStore()
+        with self._lock:
+            clone._pages = dict(self._pages)
+        return clone
+
+    def to_state(self):
+        """Daftar [url, title, waktu fetch (ISO), status, hash] untuk checkpoint"""
+        with self._lock:
+            return [[meta.url, meta.title, meta.fetched_at.isoformat(), meta.status, meta.content_hash]
+                    for meta in self._pages.values()]
+
+    def load_state(self, state):
+        """Tambahkan metadata dari to_state()"""
+        with self._lock:
+            for url, title, fetched_at, status, digest in state:
+                self._pages[url] = PageMeta(url, title, datetime.fromisoformat(fetched_at), status, digest)
+
+    def get(self, url):
+        with self._lock:
+            return self._pages.get(url)
+
+    def __contains__(self, url):
+        with self._lock:
+            return url in self._pages
+
+    def __len__(self):
+        with self._lock:
+            return len(self._pages)
@@ -0,0 +1,315 @@
+"""Penyimpanan hasil scraping secara streaming ke file JSON Lines"""
+import codecs
+import csv
+import gzip
+import importlib.util
+import itertools
+import json
+import mmap
+import os
+import re
+import shutil
+import threading
+import time
+from array import array
+from datetime import datetime
+
+RESULT_COLUMNS = ('url', 'selector', 'content')
+
+# Jumlah record per chunk saat ekspor kolumnar
+EXPORT_CHUNK_SIZE = 50000
+
+
+class JsonlSink:
+    """Menulis record hasil scraping ke file .jsonl per batch
+
+    Record ditampung paling banyak batch_size baris atau flush_interval detik
+    sebelum ditulis, sehingga memori tetap kecil dan hasil yang sudah di-flush
+    tidak hilang jika proses mati di tengah crawl.
+
+    offset dan count dari checkpoint() dipakai untuk melanjutkan file yang sama:
+    record yang ditulis setelah checkpoint dibuang. Tanpa offset file selalu
+    dibuat baru; FileExistsError jika path sudah ada, supaya dua crawl tidak
+    pernah menulis ke file yang sama.
+    """
+
+    def __init__(self, path, batch_size=200, flush_interval=2.0, offset=None, count=0):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if offset is not None and os.path.exists(path):
+            with open(path, 'r+b') as f:
+                f.truncate(offset)
+
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.count = count
+
+        self._file = open(path, 'a' if offset is not None else 'x', encoding='utf-8')
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def write(self, record):
+        self.write_many([record])
+
+    def write_many(self, records):
+        with self._lock:
+            for record in records:
+                self._buffer.append(json.dumps(record, ensure_ascii=False))
+            self.count += len(records)
+            if (len(self._buffer) >= self.batch_size or
+                    time.monotonic() - self._last_flush >= self.flush_interval):
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if self._buffer and not self._file.closed:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._file.flush()
+        self._buffer = []
+        self._last_flush = time.monotonic()
+
+    def checkpoint(self):
+        """Flush lalu return (ukuran file dalam byte, jumlah record) sebagai posisi lanjut"""
+        with self._lock:
+            self._flush_locked()
+            return os.fstat(self._file.fileno()).st_size, self.count
+
+    def close(self):
+        with self._lock:
+            self._flush_locked()
+            self._file.close()
+
+    def iter_records(self):
+        """Baca ulang semua record dari file tanpa memuat semuanya ke memori"""
+        self.flush()
+        return iter_jsonl(self.path)
+
+    def export(self, file_path):
+        """Ekspor hasil sesuai ekstensi file_path
+
+        .jsonl disalin apa adanya, .parquet dan .csv/.csv.gz ditulis per chunk,
+        selain itu format JSON lama.
+        """
+        self.flush()
+        if file_path.endswith('.jsonl'):
+            shutil.copyfile(self.path, file_path)
+        elif file_path.endswith('.parquet'):
+            export_parquet(iter_jsonl(self.path), file_path)
+        elif file_path.endswith(('.csv', '.csv.gz')):
+            export_csv(iter_jsonl(self.path), file_path)
+        else:
+            export_json(iter_jsonl(self.path), self.count, file_path)
+
+
+def iter_jsonl(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def export_json(records, total_items, file_path):
+    """Tulis {'timestamp', 'total_items', 'data': [...]} secara streaming, satu record per baris"""
+    with open(file_path, 'w', encoding='utf-8') as f:
+        header = json.dumps({
+            'timestamp': datetime.now().isoformat(),
+            'total_items': total_items
+        }, ensure_ascii=False)
+        f.write(header[:-1] + ',\n  "data": [\n')
+
+        first = True
+        for record in records:
+            if not first:
+                f.write(",\n")
+            f.write("    " + json.dumps(record, ensure_ascii=False))
+            first = False
+
+        f.write("\n  ]\n}\n")
+
+
+def parquet_available():
+    """True jika pyarrow terinstal dan ekspor Parquet bisa dipakai
+
+    Hanya mencari modulnya; pyarrow sendiri baru di-import saat ekspor.
+    """
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def export_parquet(records, file_path, chunk_size=EXPORT_CHUNK_SIZE, compression='zstd'):
+    """Tulis record ke Parquet per chunk, kolom url dan selector di-dictionary-encode
+
+    url dan selector berulang untuk setiap elemen, sehingga dictionary encoding
+    menyimpan setiap nilai sekali saja. Memori dibatasi oleh chunk_size.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Ekspor Parquet membutuhkan paket pyarrow, gunakan .csv.gz sebagai alternatif")
+
+    schema = pa.schema([
+        ('url', pa.dictionary(pa.int32(), pa.string())),
+        ('selector', pa.dictionary(pa.int32(), pa.string())),
+        ('content', pa.string()),
+    ])
+    records = iter(records)
+
+    with pq.ParquetWriter(file_path, schema, compression=compression,
+                          use_dictionary=['url', 'selector']) as writer:
+        while True:
+            chunk = list(itertools.islice(records, chunk_size))
+            if not chunk:
+                break
+            columns = [
+                pa.array([record.get('url') for record in chunk], pa.string()).dictionary_encode(),
+                pa.array([record.get('selector') for record in chunk], pa.string()).dictionary_encode(),
+                pa.array([record.get('content') for record in chunk], pa.string()),
+            ]
+            writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+
+
+def export_csv(records, file_path):
+    """Tulis record ke CSV secara streaming, dikompres gzip jika nama file berakhiran .gz"""
+    if file_path.endswith('.gz'):
+        f = gzip.open(file_path, 'wt', encoding='utf-8', newline='')
+    else:
+        f = open(file_path, 'w', encoding='utf-8', newline='')
+
+    with f:
+        writer = csv.writer(f)
+        writer.writerow(RESULT_COLUMNS)
+        for record in records:
+            writer.writerow([record.get(column, '') for column in RESULT_COLUMNS])
+
+
+class RecordIndex:
+    """Index offset record untuk file hasil, dibaca sesuai permintaan lewat mmap
+
+    Mendukung .jsonl, file .json hasil export_json() (satu record per baris)
+    dan file JSON lama yang di-indent penuh. Yang disimpan di memori hanya
+    offset awal setiap record (8 byte per record); untuk file yang di-indent
+    juga offset akhirnya, karena satu record tersebar di beberapa baris.
+    Membangun offset membaca seluruh file, jadi jangan dibuat di thread UI.
+    """
+
+    # Ukuran potongan file yang di-decode sekaligus saat memindai file yang di-indent
+    SCAN_CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, path):
+        self.path = path
+        self.offsets = array('Q')
+        self.ends = None
+        self._mmap = None
+        self._file = open(path, 'rb')
+
+        if os.path.getsize(path) > 0:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._build_offsets()
+            if not self.offsets:
+                # Format lama (json.dump dengan indent): tidak ada record per baris
+                self.ends = array('Q')
+                self._scan_array()
+
+    def _build_offsets(self):
+        offset = 0
+        self._file.seek(0)
+        for line in self._file:
+            record = line.strip().rstrip(b',')
+            if record[:1] == b'{' and record[-1:] == b'}':
+                self.offsets.append(offset)
+            offset += len(line)
+
+    def _array_start(self):
+        """Offset byte setelah '[' pembuka daftar record: {"data": [...]} atau [...] di level teratas"""
+        first = re.compile(rb'\s*').match(self._mmap).end()
+        if self._mmap[first:first + 1] == b'[':
+            return first + 1
+        match = re.compile(rb'"data"\s*:\s*\[').search(self._mmap)
+        if match is None:
+            raise ValueError("File JSON tidak berisi daftar 'data'")
+        return match.end()
+
+    def _scan_array(self):
+        """Catat offset awal dan akhir setiap record di daftar JSON dengan JSONDecoder.raw_decode
+
+        File di-decode per potongan SCAN_CHUNK_SIZE, sehingga memori tetap kecil
+        walaupun filenya besar. Record yang terpotong di ujung potongan
+        di-decode ulang dari awal record pada potongan berikutnya.
+        """
+        decoder = json.JSONDecoder()
+        separator = re.compile(r'[ \t\r\n,]*')
+        size = len(self._mmap)
+        position = self._array_start()
+        chunk_size = self.SCAN_CHUNK_SIZE
+
+        while position < size:
+            chunk_end = min(position + chunk_size, size)
+            # Decoder incremental menahan byte UTF-8 yang terpotong di ujung potongan
+            text = codecs.getincrementaldecoder('utf-8')().decode(self._mmap[position:chunk_end])
+            index = 0
+            found = len(self.offsets)
+            while True:
+                skip = separator.match(text, index).end()
+                position += skip - index  # pemisah selalu ASCII, 1 karakter = 1 byte
+                index = skip
+                if index >= len(text):
+                    break
+                if text[index] == ']':
+                    return
+                try:
+                    _, end = decoder.raw_decode(text, index)
+                except json.JSONDecodeError:
+                    if chunk_end >= size:
+                        raise
+                    break
+                end_byte = position + len(text[index:end].encode('utf-8'))
+                self.offsets.append(position)
+                self.ends.append(end_byte)
+                position, index = end_byte, end
+
+            if len(self.offsets) == found:
+                # Tidak ada record utuh di potongan ini: perbesar potongan
+                chunk_size *= 2
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def raw(self, number):
+        """Teks mentah record ke-number (bytes), tanpa parsing JSON"""
+        start = self.offsets[number]
+        if self.ends is not None:
+            return self._mmap[start:self.ends[number]]
+        end = self._mmap.find(b'\n', start)
+        if end == -1:
+            end = len(self._mmap)
+        return self._mmap[start:end].strip().rstrip(b',')
+
+    def get(self, number):
+        return json.loads(self.raw(number).decode('utf-8'))
+
+    def filter_url(self, text):
+        """Nomor record yang url-nya mengandung text, dipindai tanpa memuat semua record
+
+        Membaca seluruh file, jadi jangan dipanggil di thread UI.
+        """
+        text = text.lower()
+        needle = text.encode('utf-8')
+        matches = []
+        for number in range(len(self.offsets)):
+            raw = self.raw(number)
+            # Cek cepat di bytes dulu, parse JSON hanya untuk kandidat
+            if needle in raw.lower() and text in str(json.loads(raw.decode('utf-8')).get('url', '')).lower():
+                matches.append(number)
+        return matches
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
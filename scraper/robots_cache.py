@@ -0,0 +1,146 @@
+"""Cache robots.txt per host: diambil sekali, disimpan di memori dan di disk dengan TTL"""
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+# robots.txt yang gagal diambil (5xx / koneksi) dicoba lagi lebih cepat dari TTL biasa
+ERROR_TTL = 300
+
+
+def robots_origin(url):
+    """Kunci cache: scheme://host[:port], karena http dan https bisa punya robots.txt berbeda"""
+    parts = urlsplit(url)
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}"
+
+
+def build_parser(status, body):
+    """RobotFileParser dari hasil fetch robots.txt, mengikuti aturan RobotFileParser.read()
+
+    401/403 berarti semua URL dilarang, 4xx lain (termasuk 404) dan fetch yang
+    gagal berarti semua URL boleh diambil.
+    """
+    parser = RobotFileParser()
+    if status in (401, 403):
+        parser.disallow_all = True
+    elif status is None or status >= 400:
+        parser.allow_all = True
+    else:
+        parser.parse((body or '').splitlines())
+    return parser
+
+
+class RobotsCache:
+    """Aturan robots.txt per host untuk dicek sebelum URL masuk frontier
+
+    fetch(url) mengambil robots.txt dan return (status, text), atau raise jika
+    gagal. Setiap host hanya diambil sekali walaupun banyak worker bertanya
+    bersamaan; hasilnya disimpan di memori dan di file SQLite path (jika ada)
+    selama ttl detik, sehingga crawl berikutnya tidak perlu mengambil ulang.
+
+    on_crawl_delay(origin, seconds) dipanggil sekali per host yang robots.txt-nya
+    menetapkan Crawl-delay.
+    """
+
+    def __init__(self, fetch, path=None, ttl=86400, user_agent='*', on_crawl_delay=None):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.user_agent = user_agent
+        self.on_crawl_delay = on_crawl_delay
+        self.fetched = 0
+        self.disallowed = 0
+
+        self._rules = {}  # origin -> (RobotFileParser, waktu kedaluwarsa)
+        self._loading = {}  # origin -> Event, selama robots.txt host itu sedang diambil
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS robots (
+                    origin TEXT PRIMARY KEY,
+                    status INTEGER,
+                    body TEXT,
+                    fetched_at REAL NOT NULL
+                )
+            """)
+            self._db.commit()
+
+    def allowed(self, url):
+        """True jika url boleh diambil menurut robots.txt host-nya"""
+        if self._parser(robots_origin(url)).can_fetch(self.user_agent, url):
+            return True
+        with self._lock:
+            self.disallowed += 1
+        return False
+
+    def _parser(self, origin):
+        with self._lock:
+            cached = self._rules.get(origin)
+            if cached and cached[1] > time.time():
+                return cached[0]
+            loading = self._loading.get(origin)
+            owner = loading is None
+            if owner:
+                loading = self._loading[origin] = threading.Event()
+
+        if not owner:
+            # Worker lain sedang mengambil robots.txt host ini
+            loading.wait()
+            with self._lock:
+                return self._rules[origin][0]
+
+        parser = None
+        try:
+            parser, expires = self._load(origin)
+        finally:
+            with self._lock:
+                if parser is None:
+                    parser, expires = build_parser(None, None), time.time() + ERROR_TTL
+                self._rules[origin] = (parser, expires)
+                del self._loading[origin]
+            loading.set()
+
+        delay = parser.crawl_delay(self.user_agent)
+        if delay and self.on_crawl_delay:
+            self.on_crawl_delay(origin, float(delay))
+        return parser
+
+    def _load(self, origin):
+        """Ambil aturan dari disk jika masih berlaku, selain itu fetch robots.txt"""
+        now = time.time()
+        row = None
+        if self._db is not None:
+            with self._lock:
+                row = self._db.execute("SELECT status, body, fetched_at FROM robots WHERE origin = ?",
+                                       (origin,)).fetchone()
+        if row is not None:
+            status, body, fetched_at = row
+            ttl = self.ttl if status is not None and status < 500 else ERROR_TTL
+            if fetched_at + ttl > now:
+                return build_parser(status, body), fetched_at + ttl
+
+        try:
+            status, body = self.fetch(origin + "/robots.txt")
+        except Exception:
+            status, body = None, None
+        with self._lock:
+            self.fetched += 1
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO robots (origin, status, body, fetched_at) "
+                                 "VALUES (?, ?, ?, ?)", (origin, status, body, now))
+                self._db.commit()
+
+        ttl = self.ttl if status is not None and status < 500 else ERROR_TTL
+        return build_parser(status, body), now + ttl
+
+    def summary(self):
+        return (f"{len(self._rules)} host, {self.fetched} robots.txt diambil, "
+                f"{self.disallowed} URL dilarang")
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
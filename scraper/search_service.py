@@ -0,0 +1,176 @@
+"""Pencarian index Whoosh dengan searcher berumur panjang dan cache query/hasil"""
+import threading
+import time
+from collections import OrderedDict
+
+from doc_store import DocStore, doc_store_path
+from indexer import open_or_create_index, uses_doc_store
+
+
+class LRUCache:
+    """Cache LRU kecil berbasis OrderedDict"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+
+    def get(self, key):
+        value = self._items.get(key)
+        if value is not None:
+            self._items.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def clear(self):
+        self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
+class SearchPage:
+    """Satu halaman hasil pencarian, dilepas dari searcher supaya aman disimpan di cache"""
+
+    __slots__ = ('query_text', 'pagenum', 'pagecount', 'total', 'hits', 'elapsed', 'cached')
+
+    def __init__(self, query_text, pagenum, pagecount, total, hits, elapsed=0.0, cached=False):
+        self.query_text = query_text
+        self.pagenum = pagenum
+        self.pagecount = pagecount
+        self.total = total
+        # Daftar dict field tersimpan; highlight diambil terpisah lewat SearchService.highlight()
+        self.hits = hits
+        self.elapsed = elapsed
+        self.cached = cached
+
+
+class SearchService:
+    """Satu searcher Whoosh yang dipakai ulang antar pencarian
+
+    Query dicari di beberapa field sekaligus (default title dan content) dengan
+    bobot per field, lalu diambil per halaman lewat search_page() sehingga hanya
+    halaman yang ditampilkan yang diproses. Highlight dihitung terpisah per hit
+    yang benar-benar ditampilkan.
+
+    Sebelum setiap pencarian searcher diperiksa dengan up_to_date(); jika
+    index sudah di-commit (oleh crawl, index manual atau proses lain) searcher
+    di-refresh dan cache hasil dikosongkan. Query yang sudah di-parse disimpan
+    terpisah karena tidak bergantung pada isi index.
+
+    Untuk index dengan schema ramping (content tidak disimpan), teks untuk
+    highlight dibaca dari DocStore di folder index.
+    """
+
+    def __init__(self, index_dir, schema, fields=('title', 'content'), field_boosts=None,
+                 highlight_field='content', query_cache_size=256, result_cache_size=64):
+        self.index_dir = index_dir
+        self.schema = schema
+        self.fields = list(fields)
+        self.field_boosts = field_boosts if field_boosts is not None else {'title': 2.0, 'content': 1.0}
+        self.highlight_field = highlight_field
+        self._ix = None
+        self._searcher = None
+        self._parser = None
+        self._doc_store = None
+        self._queries = LRUCache(query_cache_size)
+        self._results = LRUCache(result_cache_size)
+        self._highlights = LRUCache(result_cache_size * 10)
+        self._lock = threading.Lock()
+
+    def _current_searcher(self):
+        if self._searcher is None:
+            from whoosh.qparser import MultifieldParser
+
+            self._ix = open_or_create_index(self.index_dir, self.schema)
+            self._parser = MultifieldParser(self.fields, self._ix.schema, fieldboosts=self.field_boosts)
+            self._searcher = self._ix.searcher()
+            if uses_doc_store(self._ix.schema):
+                self._doc_store = DocStore(doc_store_path(self.index_dir))
+        elif not self._searcher.up_to_date():
+            # Index berubah sejak searcher dibuka: hanya segmen baru yang dibaca ulang
+            self._searcher = self._searcher.refresh()
+            self._results.clear()
+            self._highlights.clear()
+        return self._searcher
+
+    def parse(self, text):
+        query = self._queries.get(text)
+        if query is None:
+            query = self._parser.parse(text)
+            self._queries.put(text, query)
+        return query
+
+    def search_page(self, text, pagenum=1, pagelen=10):
+        """Cari text dan return SearchPage ke-pagenum (mulai dari 1)
+
+        Halaman yang sama diambil dari cache selama index tidak berubah.
+        """
+        started = time.perf_counter()
+        with self._lock:
+            searcher = self._current_searcher()
+            key = (text, pagenum, pagelen)
+            cached = self._results.get(key)
+            if cached is not None:
+                return SearchPage(text, cached.pagenum, cached.pagecount, cached.total, cached.hits,
+                                  time.perf_counter() - started, cached=True)
+
+            results = searcher.search_page(self.parse(text), pagenum, pagelen=pagelen)
+            # Teks lengkap tidak ikut di-cache, highlight() membacanya sendiri jika perlu
+            hits = [{name: value for name, value in hit.fields().items() if name != self.highlight_field}
+                    for hit in results]
+            page = SearchPage(text, results.pagenum, results.pagecount, results.total, hits)
+            self._results.put(key, page)
+            page.elapsed = time.perf_counter() - started
+            return page
+
+    def highlight(self, text, hit):
+        """Cuplikan highlight query text untuk satu hit dari search_page(), dihitung saat dibutuhkan"""
+        key = (text, hit.get('url'))
+        with self._lock:
+            searcher = self._current_searcher()
+            fragment = self._highlights.get(key)
+            if fragment is not None:
+                return fragment
+
+            content = hit.get(self.highlight_field)
+            if content is None:
+                content = self._load_content(searcher, hit.get('url'))
+            fragment = self._highlight_text(self.parse(text), content)
+            self._highlights.put(key, fragment)
+            return fragment
+
+    def _load_content(self, searcher, url):
+        if self._doc_store is not None and self.highlight_field == 'content':
+            return self._doc_store.get(url) or ''
+        stored = searcher.document(url=url) or {}
+        return stored.get(self.highlight_field, '')
+
+    def _highlight_text(self, query, content):
+        from whoosh import highlight
+
+        field = self.highlight_field
+        terms = {word for fieldname, word in query.all_terms() if fieldname == field}
+        if not content or not terms:
+            return ''
+        return highlight.highlight(content, terms, self._ix.schema[field].analyzer,
+                                   highlight.ContextFragmenter(), highlight.HtmlFormatter(), top=3)
+
+    def invalidate(self):
+        """Kosongkan cache hasil secara eksplisit"""
+        with self._lock:
+            self._results.clear()
+            self._highlights.clear()
+
+    def close(self):
+        with self._lock:
+            if self._searcher is not None:
+                self._searcher.close()
+                self._searcher = None
+            if self._doc_store is not None:
+                self._doc_store.close()
+                self._doc_store = None
@@ -0,0 +1,40 @@
+import functools
+import os
+import sys
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Modul aplikasi di-import sebagai modul top-level, sama seperti saat scraper.py dijalankan
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def write_site(root, pages=8):
+    """Situs kecil: index.html menautkan halaman p1..pN, setiap halaman kembali ke index"""
+    links = "".join(f'<a href="p{i}.html">p{i}</a>' for i in range(1, pages + 1))
+    (root / "index.html").write_text(f"<html><head><title>Beranda</title></head>"
+                                     f"<body><p>beranda</p>{links}</body></html>", encoding="utf-8")
+    for i in range(1, pages + 1):
+        (root / f"p{i}.html").write_text(f"<html><head><title>Halaman {i}</title></head>"
+                                         f"<body><p>isi halaman {i}</p><a href=\"index.html\">home</a></body></html>",
+                                         encoding="utf-8")
+
+
+@pytest.fixture
+def site(tmp_path):
+    """URL index.html situs lokal dengan 9 halaman, dilayani http.server di thread"""
+    root = tmp_path / "site"
+    root.mkdir()
+    write_site(root)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(QuietHandler, directory=str(root)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/index.html"
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,74 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import async_fetcher
+from crawl_engine import HostScheduler
+from crawler_core import Crawler
+from test_crawler import crawl_config, scraped_urls
+
+pytestmark = pytest.mark.skipif(not async_fetcher.is_available(), reason="aiohttp tidak terinstal")
+
+SITE_PAGES = 9
+
+
+def test_async_crawl_visits_every_page(site, tmp_path):
+    crawler = Crawler(crawl_config(site, tmp_path, fetch_mode='async', num_workers=4))
+    assert crawler.run() == SITE_PAGES
+    assert len(set(scraped_urls(crawler))) == SITE_PAGES
+
+
+def test_async_engine_resolves_links_and_stops_when_done(site):
+    visited = []
+
+    def handler(url, page, depth):
+        visited.append(url)
+        if depth == 0:
+            return [site.replace('index.html', f'p{i}.html') for i in range(1, 4)]
+        return None
+
+    engine = async_fetcher.AsyncCrawlEngine(handler, max_depth=1, num_workers=3)
+    assert engine.run(site) == 4
+    assert sorted(visited) == sorted([site] + [site.replace('index.html', f'p{i}.html') for i in range(1, 4)])
+    assert engine.frontier.on_change is None
+
+
+class ForbiddenHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(403)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.mark.parametrize('scheduler', [HostScheduler(5, 5), None])
+def test_stop_during_403_backoff_returns_without_retry(scheduler):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ForbiddenHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    active = [True]
+    errors = []
+    failed = []
+
+    def report(kind, message):
+        if kind == 'error':
+            errors.append(message)
+            # Crawl dihentikan selama jeda backoff 403
+            active[0] = False
+
+    engine = async_fetcher.AsyncCrawlEngine(lambda url, page, depth: None, max_depth=0,
+                                            is_active=lambda: active[0], scheduler=scheduler,
+                                            report=report, max_retries=3, on_fetch_failed=failed.append)
+    started = time.monotonic()
+    try:
+        engine.run(url)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert time.monotonic() - started < 2
+    assert len(errors) == 1
+    assert failed == [url]
@@ -0,0 +1,160 @@
+import threading
+import time
+
+import pytest
+
+from crawl_engine import CrawlEngine, Frontier, HostScheduler, normalize_url
+
+
+@pytest.mark.parametrize('url, expected', [
+    ('http://Example.COM/a/#top', 'http://example.com/a'),
+    ('https://example.com:443/', 'https://example.com/'),
+    ('http://example.com:8080', 'http://example.com:8080/'),
+    ('http://example.com/?b=2&a=1', 'http://example.com/?a=1&b=2'),
+    ('http://user:pw@example.com/x', 'http://user:pw@example.com/x'),
+    ('http://[::1]:8000/x/', 'http://[::1]:8000/x'),
+])
+def test_normalize_url(url, expected):
+    assert normalize_url(url) == expected
+
+
+def test_frontier_adds_each_url_once():
+    frontier = Frontier()
+    assert frontier.add('http://example.com/a', 0)
+    assert not frontier.add('http://example.com/a/#x', 1)
+    assert not frontier.add('mailto:someone@example.com', 0)
+    assert len(frontier) == 1
+
+
+def site_handler(pages, log=None):
+    """Handler CrawlEngine untuk situs tiruan {url: [link, ...]}"""
+    lock = threading.Lock()
+
+    def handler(url, depth):
+        with lock:
+            if log is not None:
+                log.append(url)
+        return pages.get(url)
+    return handler
+
+
+def test_engine_visits_each_page_once_and_terminates():
+    pages = {
+        'http://a.test/': ['http://a.test/1', 'http://a.test/2'],
+        'http://a.test/1': ['http://a.test/', 'http://a.test/2#frag'],
+        'http://a.test/2': ['http://a.test/1', 'http://a.test/3'],
+        'http://a.test/3': ['http://a.test/'],
+    }
+    log = []
+    engine = CrawlEngine(site_handler(pages, log), max_depth=5, num_workers=3)
+    assert engine.run('http://a.test/') == 4
+    assert sorted(log) == sorted(pages)
+    assert engine.frontier.is_done()
+
+
+def test_engine_respects_max_depth():
+    pages = {'http://a.test/': ['http://a.test/1'], 'http://a.test/1': ['http://a.test/2']}
+    log = []
+    CrawlEngine(site_handler(pages, log), max_depth=1).run('http://a.test/')
+    assert log == ['http://a.test/', 'http://a.test/1']
+
+
+def test_engine_handler_error_does_not_stop_crawl():
+    errors = []
+
+    def handler(url, depth):
+        if url.endswith('/bad'):
+            raise RuntimeError('gagal')
+        return ['http://a.test/bad', 'http://a.test/ok'] if depth == 0 else None
+
+    engine = CrawlEngine(handler, max_depth=2, on_error=lambda url, e: errors.append(url))
+    assert engine.run('http://a.test/') == 2
+    assert errors == ['http://a.test/bad']
+
+
+def test_ready_host_is_not_blocked_by_busy_host():
+    links = [f'http://a.test/{i}' for i in range(4)] + ['http://b.test/x']
+    pages = {'http://a.test/': links}
+    visited = {}
+    started = time.monotonic()
+
+    def handler(url, depth):
+        visited[url] = time.monotonic() - started
+        return pages.get(url)
+
+    engine = CrawlEngine(handler, max_depth=1, num_workers=2, scheduler=HostScheduler(0.3, 0.3))
+    engine.run('http://a.test/')
+    assert len(visited) == 6
+    # b.test tidak menunggu antrian a.test yang dijeda 0.3 detik per request
+    assert visited['http://b.test/x'] < 0.2
+    assert visited['http://a.test/3'] >= 1.1
+
+
+def test_host_scheduler_try_reserve():
+    scheduler = HostScheduler(10, 10)
+    assert scheduler.try_reserve('http://a.test/1')
+    assert not scheduler.try_reserve('http://a.test/2')
+    assert scheduler.try_reserve('http://b.test/1')
+    assert scheduler.ready_at('http://a.test/') > time.monotonic() + 9
+
+
+def test_frontier_requeue_and_snapshot():
+    frontier = Frontier()
+    frontier.add('http://example.com/a', 0)
+    frontier.add('http://example.com/b', 1)
+    item = frontier.pop(timeout=0)
+
+    pending, seen = frontier.snapshot()
+    assert pending == [('http://example.com/a', 0), ('http://example.com/b', 1)]
+
+    frontier.task_done(item, requeue=True)
+    assert frontier.pop(timeout=0) == item
+
+    restored = Frontier()
+    restored.restore(pending, seen.to_state())
+    assert len(restored) == 2
+    assert not restored.add('http://example.com/b', 2)
+
+
+def test_engine_max_pages_keeps_unvisited_urls_pending():
+    pages = {'http://a.test/': [f'http://a.test/{i}' for i in range(6)]}
+    engine = CrawlEngine(site_handler(pages), max_depth=2, num_workers=2, max_pages=3)
+    assert engine.run('http://a.test/') == 3
+
+    state = engine.snapshot()
+    assert len(state['pending']) == 4
+    assert state['pages_crawled'] == 3
+
+
+def test_frontier_admit_rejects_without_queueing():
+    frontier = Frontier(admit=lambda url: 'private' not in url)
+    assert not frontier.add('http://example.com/private', 0)
+    assert not frontier.add('http://example.com/private', 0)
+    assert frontier.is_done()
+
+
+def test_host_scheduler_backoff_stops_when_inactive():
+    scheduler = HostScheduler(5, 5)
+    active = [True]
+    timer = threading.Timer(0.3, lambda: active.__setitem__(0, False))
+    timer.start()
+    started = time.monotonic()
+    assert not scheduler.backoff('http://a.test/', lambda: active[0])
+    assert time.monotonic() - started < 1
+
+
+def test_frontier_on_change_and_pop_nowait():
+    frontier = Frontier(scheduler=HostScheduler(10, 10))
+    changes = []
+    frontier.on_change = lambda: changes.append(len(frontier))
+    frontier.add('http://a.test/1', 0)
+    frontier.add('http://a.test/2', 0)
+    assert changes == [1, 2]
+
+    item, wait = frontier.pop_nowait()
+    assert item == ('http://a.test/1', 0) and wait is None
+    # Host a.test baru siap lagi setelah jeda 10 detik
+    item, wait = frontier.pop_nowait()
+    assert item is None and 9 < wait <= 10
+    frontier.task_done(('http://a.test/1', 0))
+    assert len(changes) == 3
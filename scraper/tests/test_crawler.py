@@ -0,0 +1,128 @@
+import glob
+import json
+import os
+
+import pytest
+
+from checkpoint import CHECKPOINT_SUFFIX
+from crawler_core import CrawlConfig, Crawler, index_results
+from indexer import BatchIndexer
+from page_store import PageStore
+from result_sink import iter_jsonl
+
+SITE_PAGES = 9
+
+
+def crawl_config(site, tmp_path, **options):
+    values = dict(start_url=site, max_depth=2, selectors='p', num_workers=2, delay_min=0, delay_max=0,
+                  auto_index=False, cache_path=None, index_dir=str(tmp_path / 'index'),
+                  results_dir=str(tmp_path / 'results'), checkpoint_interval=60)
+    values.update(options)
+    return CrawlConfig(**values)
+
+
+def collect_events():
+    events = []
+    return events, lambda kind, message: events.append((kind, message))
+
+
+def scraped_urls(crawler):
+    return [record['url'] for record in iter_jsonl(crawler.result_sink.path)]
+
+
+def test_crawl_visits_every_page_and_removes_checkpoint(site, tmp_path):
+    crawler = Crawler(crawl_config(site, tmp_path))
+    assert crawler.run() == SITE_PAGES
+    assert len(set(scraped_urls(crawler))) == SITE_PAGES
+    assert not os.path.exists(crawler.checkpoint_path)
+
+
+def test_resume_after_max_pages_needs_a_larger_limit(site, tmp_path):
+    events, on_event = collect_events()
+    crawler = Crawler(crawl_config(site, tmp_path, max_pages=3), on_event=on_event)
+    assert crawler.run() == 3
+    assert not crawler.stopped
+    assert any("Batas 3 halaman tercapai" in message for kind, message in events if kind == 'update')
+
+    # Batas yang sama tidak akan mengambil halaman apa pun
+    with pytest.raises(ValueError, match="batas 3 halaman"):
+        Crawler.resume(crawler.checkpoint_path)
+
+    resumed = Crawler.resume(crawler.checkpoint_path, max_pages=None)
+    assert resumed.result_sink.path == crawler.result_sink.path
+    assert resumed.run() == SITE_PAGES
+    urls = scraped_urls(resumed)
+    assert len(urls) == len(set(urls)) == SITE_PAGES
+    assert not os.path.exists(crawler.checkpoint_path)
+
+
+def test_resume_rejects_settings_that_conflict_with_checkpoint(site, tmp_path):
+    crawler = Crawler(crawl_config(site, tmp_path, max_pages=2))
+    crawler.run()
+
+    with pytest.raises(ValueError, match="max_depth"):
+        Crawler.resume(crawler.checkpoint_path, max_pages=None, max_depth=1)
+    # Nilai yang sama dengan checkpoint boleh diberikan
+    resumed = Crawler.resume(crawler.checkpoint_path, max_pages=5, max_depth=2, num_workers=1)
+    assert resumed.config.num_workers == 1
+    resumed.result_sink.close()
+
+
+def test_resume_restores_page_metadata_for_manual_index(site, tmp_path):
+    crawler = Crawler(crawl_config(site, tmp_path, max_pages=4, record_pages=True))
+    crawler.run()
+    assert len(crawler.page_store) == 4
+
+    # Proses baru: page_store kosong, metadata diambil dari checkpoint
+    resumed = Crawler.resume(crawler.checkpoint_path, page_store=PageStore(), max_pages=None)
+    resumed.run()
+    assert len(resumed.page_store) == SITE_PAGES
+
+    indexer = BatchIndexer(str(tmp_path / 'index'), resumed.schema)
+    page_count, _ = index_results(resumed.result_sink, resumed.page_store, indexer)
+    assert page_count == SITE_PAGES
+    with indexer.ix.searcher() as searcher:
+        titles = sorted(fields['title'] for fields in searcher.all_stored_fields())
+    assert titles == sorted(['Beranda'] + [f'Halaman {i}' for i in range(1, SITE_PAGES)])
+
+
+def cli_options(tmp_path, *options):
+    return ['--delay', '0', '0', '--workers', '2', '--no-cache', '--selectors', 'p',
+            '--results-dir', str(tmp_path / 'results'), '--index-dir', str(tmp_path / 'index')] + list(options)
+
+
+def test_cli_resume_uses_checkpoint_settings(site, tmp_path, capsys):
+    import cli
+
+    assert cli.main([site] + cli_options(tmp_path, '--index', 'manual', '--max-pages', '3')) == 0
+    checkpoint, = glob.glob(str(tmp_path / 'results' / ('*' + CHECKPOINT_SUFFIX)))
+
+    assert cli.main(['--resume', checkpoint]) == 2
+    assert "batas 3 halaman" in capsys.readouterr().err
+    assert cli.main(['--resume', checkpoint, '--max-pages', '100', '--depth', '1']) == 2
+    assert "max_depth" in capsys.readouterr().err
+
+    # --index tidak diberikan: mode manual dari checkpoint tetap dipakai
+    assert cli.main(['--resume', checkpoint, '--max-pages', '100']) == 0
+    assert f"Berhasil mengindex {SITE_PAGES} halaman" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize('backend', ['html.parser', 'lxml-direct'])
+def test_invalid_selector_is_rejected_before_files_are_created(site, tmp_path, backend):
+    with pytest.raises(ValueError, match="CSS Selector tidak valid: p >"):
+        Crawler(crawl_config(site, tmp_path, selectors='h1, p >', parser_backend=backend))
+    assert not os.path.exists(tmp_path / 'results')
+
+
+def test_cli_crawls_and_exports(site, tmp_path, capsys):
+    import cli
+
+    export_path = tmp_path / 'hasil.json'
+    assert cli.main([site] + cli_options(tmp_path, '--index', 'off', '--export', str(export_path))) == 0
+    assert f"Data berhasil disimpan ke: {export_path}" in capsys.readouterr().out
+    with open(export_path, encoding='utf-8') as f:
+        records = json.load(f)['data']
+    assert len({record['url'] for record in records}) == SITE_PAGES
+
+    assert cli.main([site] + cli_options(tmp_path, '--selectors', 'p >')) == 2
+    assert "CSS Selector tidak valid" in capsys.readouterr().err
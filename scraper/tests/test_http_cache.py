@@ -0,0 +1,57 @@
+import pytest
+
+from http_cache import HttpCache
+from page_parser import PageResult
+
+RESULT = PageResult('Judul', 'teks', ['/a'], [('p', 'isi')])
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = HttpCache(str(tmp_path / 'cache.sqlite'))
+    yield cache
+    cache.close()
+
+
+def test_store_and_get_round_trip(cache):
+    cache.store('http://a.test/x/#top', 'hash1', 'key', RESULT, etag='"v1"',
+                last_modified='Mon, 01 Jan 2024 00:00:00 GMT', body='<p>isi</p>')
+
+    # Kunci memakai URL ternormalisasi
+    entry = cache.get('http://A.test/x')
+    assert entry.content_hash == 'hash1' and entry.parse_key == 'key'
+    assert (entry.result.title, entry.result.hrefs, entry.result.matches) == ('Judul', ['/a'], [('p', 'isi')])
+    assert entry.conditional_headers() == {'If-None-Match': '"v1"',
+                                           'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'}
+    assert cache.body('http://a.test/x') == '<p>isi</p>'
+    assert cache.get('http://a.test/other') is None
+
+
+def test_full_response_replaces_validators_even_when_missing(cache):
+    cache.store('http://a.test/', 'hash1', 'key', RESULT, etag='"v1"', last_modified='kemarin', body='lama')
+    # Respons 200 berikutnya tanpa ETag dan Last-Modified
+    cache.store('http://a.test/', 'hash2', 'key', RESULT, body='baru')
+
+    entry = cache.get('http://a.test/')
+    assert entry.conditional_headers() == {}
+    assert cache.body('http://a.test/') == 'baru'
+
+
+def test_not_modified_keeps_validators_and_body(cache):
+    cache.store('http://a.test/', 'hash1', 'key', RESULT, etag='"v1"', last_modified='kemarin', body='isi')
+    cache.store('http://a.test/', 'hash1', 'key2', RESULT, not_modified=True)
+
+    entry = cache.get('http://a.test/')
+    assert (entry.etag, entry.last_modified, entry.parse_key) == ('"v1"', 'kemarin', 'key2')
+    assert cache.body('http://a.test/') == 'isi'
+
+
+def test_entries_survive_reopen(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    cache = HttpCache(path, commit_every=1000)
+    cache.store('http://a.test/', 'hash1', 'key', RESULT, etag='"v1"', body='isi')
+    cache.close()
+
+    reopened = HttpCache(path)
+    assert reopened.get('http://a.test/').etag == '"v1"'
+    reopened.close()
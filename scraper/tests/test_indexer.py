@@ -0,0 +1,95 @@
+from datetime import datetime
+
+import pytest
+
+from crawler_core import default_schema
+from indexer import BatchIndexer, IndexWorker
+
+
+def page(url, content):
+    return {'url': url, 'title': url.rsplit('/', 1)[-1], 'content': content, 'date': datetime(2024, 1, 1)}
+
+
+def stored_documents(indexer):
+    with indexer.ix.searcher() as searcher:
+        return {fields['url']: fields for fields in searcher.all_stored_fields()}
+
+
+@pytest.fixture
+def index_dir(tmp_path):
+    return str(tmp_path / 'index')
+
+
+def test_unchanged_page_is_skipped_on_next_crawl(index_dir):
+    indexer = BatchIndexer(index_dir, default_schema())
+    indexer.add_document(**page('http://a.test/1', 'satu'))
+    indexer.close()
+
+    indexer = BatchIndexer(index_dir, default_schema())
+    indexer.add_document(**page('http://a.test/1', 'satu'))
+    indexer.close()
+    assert indexer.documents_skipped == 1
+    assert indexer.documents_indexed == 0
+
+
+def test_changed_page_replaces_document(index_dir):
+    indexer = BatchIndexer(index_dir, default_schema(), batch_size=1)
+    indexer.add_document(**page('http://a.test/1', 'lama'))
+    indexer.add_document(**page('http://a.test/1', 'baru'))
+    indexer.flush()
+
+    documents = stored_documents(indexer)
+    indexer.close()
+    assert len(documents) == 1
+    assert documents['http://a.test/1']['content'] == 'baru'
+
+
+@pytest.mark.parametrize('store_content', [True, False])
+def test_delete_missing_prunes_only_untouched_urls_under_prefix(index_dir, store_content):
+    indexer = BatchIndexer(index_dir, default_schema(store_content))
+    for url in ('http://a.test/1', 'http://a.test/2', 'http://a.test/3', 'http://b.test/1'):
+        indexer.add_document(**page(url, url))
+    indexer.close()
+
+    indexer = BatchIndexer(index_dir, default_schema(store_content))
+    indexer.add_document(**page('http://a.test/1', 'http://a.test/1'))
+    # Gagal diambil pada crawl ini, tapi tidak boleh dihapus
+    indexer.keep('http://a.test/2')
+    assert indexer.delete_missing('http://a.test/') == 1
+
+    assert sorted(stored_documents(indexer)) == ['http://a.test/1', 'http://a.test/2', 'http://b.test/1']
+    if not store_content:
+        assert indexer.doc_store.get('http://a.test/3') is None
+        assert indexer.doc_store.get('http://a.test/2') == 'http://a.test/2'
+    indexer.close()
+    assert indexer.documents_deleted == 1
+
+
+def test_index_worker_sync_commits_submitted_documents(index_dir):
+    indexer = BatchIndexer(index_dir, default_schema(), batch_size=1000, commit_interval=60)
+    worker = IndexWorker(indexer)
+    worker.start()
+    for i in range(5):
+        worker.submit(**page(f'http://a.test/{i}', 'isi'))
+    worker.sync()
+    assert indexer.ix.doc_count() == 5
+    worker.close()
+
+
+def test_failed_commit_does_not_mark_page_as_indexed(index_dir, monkeypatch):
+    indexer = BatchIndexer(index_dir, default_schema())
+    open_writer = indexer.ix.writer
+
+    def locked_writer(**options):
+        raise OSError("disk penuh")
+
+    monkeypatch.setattr(indexer.ix, 'writer', locked_writer)
+    indexer.add_document(**page('http://a.test/1', 'satu'))
+    with pytest.raises(OSError):
+        indexer.flush()
+
+    monkeypatch.setattr(indexer.ix, 'writer', open_writer)
+    indexer.add_document(**page('http://a.test/1', 'satu'))
+    indexer.close()
+    assert indexer.documents_skipped == 0
+    assert list(stored_documents(indexer)) == ['http://a.test/1']
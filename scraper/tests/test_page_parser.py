@@ -0,0 +1,66 @@
+import pytest
+
+import page_parser
+from page_parser import extract_page, resolve_backend
+
+BACKENDS = ['html.parser', 'lxml', 'lxml-direct']
+
+HTML = """<html><head><title>Judul</title></head><body>
+<h1>Kepala</h1>
+<p>Satu <b>tebal</b></p>
+<div class="isi"><a href="/a">A</a><a>tanpa href</a><a href="http://b.test/">B</a></div>
+<p class="akhir">Dua</p>
+</body></html>"""
+
+
+def test_resolve_backend_falls_back_without_lxml(monkeypatch):
+    assert resolve_backend('html.parser') == 'html.parser'
+    assert resolve_backend('auto') == 'lxml'
+    assert resolve_backend('lxml-direct') == 'lxml-direct'
+
+    monkeypatch.setattr(page_parser, '_module_available', lambda name: False)
+    assert resolve_backend('auto') == 'html.parser'
+    assert resolve_backend('lxml-direct') == 'html.parser'
+    with pytest.raises(ValueError):
+        resolve_backend('html5lib')
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_backends_extract_the_same_page(backend):
+    result = extract_page(HTML, backend)
+    assert result.title == 'Judul'
+    assert result.index_text == 'Kepala Satutebal Dua'
+    assert result.hrefs == ['/a', 'http://b.test/']
+    assert result.matches == []
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_extract_skips_parts_that_are_not_needed(backend):
+    result = extract_page(HTML, backend, want_index=False, want_links=False)
+    assert (result.title, result.index_text, result.hrefs) == ('Judul', '', [])
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_extract_handles_empty_and_untitled_documents(backend):
+    result = extract_page('', backend)
+    assert (result.title, result.index_text, result.hrefs, result.matches) == ('', '', [], [])
+    assert extract_page('<p>isi<script>x()</script></p>', backend).index_text == 'isi'
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_compiled_selectors_are_reused_across_pages(backend):
+    selectors = page_parser.CompiledSelectors('p, , div.isi a', backend)
+    assert len(selectors) == 2
+
+    result = extract_page(HTML, backend, selectors)
+    # Hasil berurutan per selector, seperti soup.select() per selector
+    assert result.matches == [('p', 'Satutebal'), ('p', 'Dua'),
+                              ('div.isi a', 'A'), ('div.isi a', 'tanpa href'), ('div.isi a', 'B')]
+    other = extract_page('<p>lain</p>', backend, selectors)
+    assert other.matches == [('p', 'lain')]
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_invalid_selector_raises_value_error(backend):
+    with pytest.raises(ValueError, match="a\\["):
+        page_parser.CompiledSelectors('p, a[', backend)
@@ -0,0 +1,32 @@
+import pytest
+
+from page_store import PageStore, content_hash
+
+
+def test_record_hashes_html_or_uses_digest():
+    store = PageStore()
+    assert store.record('http://a.test/', 'Judul', 200, html='<p>isi</p>').content_hash == content_hash('<p>isi</p>')
+    assert store.record('http://a.test/b', None, 200, digest='abc').content_hash == 'abc'
+    assert store.get('http://a.test/b').title == ''
+
+
+def test_record_requires_html_or_digest():
+    store = PageStore()
+    with pytest.raises(ValueError):
+        store.record('http://a.test/', 'Judul', 200)
+    assert store.get('http://a.test/') is None
+
+
+def test_state_round_trip_and_copy():
+    store = PageStore()
+    meta = store.record('http://a.test/', 'Judul', 304, digest='abc')
+
+    clone = store.copy()
+    store.record('http://a.test/b', 'Lain', 200, digest='def')
+    assert len(clone) == 1
+
+    restored = PageStore()
+    restored.load_state(clone.to_state())
+    loaded = restored.get('http://a.test/')
+    assert (loaded.title, loaded.fetched_at, loaded.status, loaded.content_hash) == \
+        ('Judul', meta.fetched_at, 304, 'abc')
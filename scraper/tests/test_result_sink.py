@@ -0,0 +1,135 @@
+import csv
+import gzip
+import json
+
+import pytest
+
+from result_sink import (RESULT_COLUMNS, JsonlSink, RecordIndex, export_csv, export_json, export_parquet,
+                         iter_jsonl, parquet_available)
+
+
+def records(count, start=0):
+    return [{'url': f'http://a.test/{i}', 'selector': 'p', 'content': f'isi {i} é'} for i in range(start, start + count)]
+
+
+def test_sink_refuses_existing_file(tmp_path):
+    path = str(tmp_path / 'hasil.jsonl')
+    JsonlSink(path).close()
+    with pytest.raises(FileExistsError):
+        JsonlSink(path)
+
+
+def test_resume_truncates_records_written_after_checkpoint(tmp_path):
+    path = str(tmp_path / 'hasil.jsonl')
+    sink = JsonlSink(path)
+    sink.write_many(records(3))
+    offset, count = sink.checkpoint()
+    # Ditulis setelah checkpoint, lalu proses mati
+    sink.write_many(records(2, start=3))
+    sink.close()
+
+    resumed = JsonlSink(path, offset=offset, count=count)
+    assert resumed.count == 3
+    resumed.write_many(records(1, start=10))
+    resumed.close()
+
+    urls = [record['url'] for record in iter_jsonl(path)]
+    assert urls == ['http://a.test/0', 'http://a.test/1', 'http://a.test/2', 'http://a.test/10']
+
+
+def test_export_json_is_valid_json(tmp_path):
+    path = str(tmp_path / 'hasil.json')
+    export_json(iter(records(3)), 3, path)
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    assert data['total_items'] == 3
+    assert data['data'] == records(3)
+
+
+def write_file(tmp_path, name, kind, items):
+    path = str(tmp_path / name)
+    if kind == 'jsonl':
+        with open(path, 'w', encoding='utf-8') as f:
+            f.writelines(json.dumps(item, ensure_ascii=False) + '\n' for item in items)
+    elif kind == 'export':
+        export_json(iter(items), len(items), path)
+    elif kind == 'indent':
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'timestamp': 'x', 'total_items': len(items), 'data': items}, f, indent=2, ensure_ascii=False)
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(items, f, indent=2, ensure_ascii=False)
+    return path
+
+
+@pytest.mark.parametrize('kind', ['jsonl', 'export', 'indent', 'list'])
+def test_record_index_formats(tmp_path, kind):
+    items = records(120)
+    index = RecordIndex(write_file(tmp_path, 'hasil.json', kind, items))
+    try:
+        assert len(index) == 120
+        assert index.get(0) == items[0]
+        assert index.get(119) == items[119]
+        assert index.filter_url('/11') == [11] + list(range(110, 120))
+    finally:
+        index.close()
+
+
+def test_record_index_indented_scan_across_chunks(tmp_path, monkeypatch):
+    # Potongan kecil memaksa record dan karakter multibyte terpotong di ujung potongan
+    monkeypatch.setattr(RecordIndex, 'SCAN_CHUNK_SIZE', 29)
+    items = [{'url': f'http://a.test/{i}', 'content': '漢字 ' * (i % 40)} for i in range(200)]
+    index = RecordIndex(write_file(tmp_path, 'hasil.json', 'indent', items))
+    try:
+        assert [index.get(number) for number in range(len(index))] == items
+    finally:
+        index.close()
+
+
+def test_record_index_empty_file(tmp_path):
+    path = tmp_path / 'kosong.jsonl'
+    path.write_text('')
+    index = RecordIndex(str(path))
+    assert len(index) == 0
+    assert index.filter_url('a') == []
+    index.close()
+
+
+@pytest.mark.parametrize('name', ['hasil.csv', 'hasil.csv.gz'])
+def test_export_csv_writes_header_and_rows(tmp_path, name):
+    path = str(tmp_path / name)
+    export_csv(iter(records(3) + [{'url': 'http://a.test/x', 'selector': 'p'}]), path)
+
+    opener = gzip.open if name.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8', newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == list(RESULT_COLUMNS)
+    assert rows[1] == ['http://a.test/0', 'p', 'isi 0 é']
+    assert rows[-1] == ['http://a.test/x', 'p', '']
+
+
+@pytest.mark.skipif(not parquet_available(), reason="pyarrow tidak terinstal")
+def test_export_parquet_in_chunks_with_dictionary_columns(tmp_path):
+    import pyarrow.parquet as pq
+
+    path = str(tmp_path / 'hasil.parquet')
+    export_parquet(iter(records(25)), path, chunk_size=10)
+
+    parquet = pq.ParquetFile(path)
+    assert parquet.metadata.num_row_groups == 3
+    table = parquet.read()
+    assert table.column('content').to_pylist() == [record['content'] for record in records(25)]
+    assert str(table.schema.field('selector').type).startswith('dictionary')
+    assert table.column('selector').to_pylist() == ['p'] * 25
+
+
+def test_sink_export_chooses_format_by_extension(tmp_path):
+    sink = JsonlSink(str(tmp_path / 'hasil.jsonl'))
+    sink.write_many(records(2))
+    sink.export(str(tmp_path / 'salinan.jsonl'))
+    sink.export(str(tmp_path / 'hasil.csv.gz'))
+    sink.close()
+
+    assert list(iter_jsonl(str(tmp_path / 'salinan.jsonl'))) == records(2)
+    with gzip.open(tmp_path / 'hasil.csv.gz', 'rt', encoding='utf-8') as f:
+        assert len(f.read().splitlines()) == 3
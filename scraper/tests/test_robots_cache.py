@@ -0,0 +1,76 @@
+import threading
+
+import pytest
+
+from robots_cache import RobotsCache, build_parser, robots_origin
+
+ROBOTS_TXT = "User-agent: *\nDisallow: /private\nCrawl-delay: 2\n"
+
+
+@pytest.mark.parametrize('status, body, url, allowed', [
+    (200, ROBOTS_TXT, 'http://a.test/private/x', False),
+    (200, ROBOTS_TXT, 'http://a.test/public', True),
+    (404, None, 'http://a.test/private/x', True),
+    (None, None, 'http://a.test/private/x', True),
+    (403, None, 'http://a.test/public', False),
+    (401, None, 'http://a.test/public', False),
+])
+def test_build_parser(status, body, url, allowed):
+    assert build_parser(status, body).can_fetch('*', url) is allowed
+
+
+def test_robots_origin_keeps_scheme_and_port():
+    assert robots_origin('HTTPS://A.test:8443/x?y') == 'https://a.test:8443'
+
+
+def test_fetches_each_host_once_and_reports_crawl_delay():
+    fetched = []
+    delays = []
+
+    def fetch(url):
+        fetched.append(url)
+        return 200, ROBOTS_TXT
+
+    cache = RobotsCache(fetch, on_crawl_delay=lambda origin, seconds: delays.append((origin, seconds)))
+    threads = [threading.Thread(target=cache.allowed, args=(f'http://a.test/{i}',)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not cache.allowed('http://a.test/private/1')
+    assert fetched == ['http://a.test/robots.txt']
+    assert delays == [('http://a.test', 2.0)]
+    assert cache.disallowed == 1
+
+
+def test_failed_fetch_allows_everything():
+    def fetch(url):
+        raise ConnectionError('down')
+
+    cache = RobotsCache(fetch)
+    assert cache.allowed('http://a.test/private')
+    assert cache.fetched == 1
+
+
+def test_disk_cache_is_reused_until_ttl(tmp_path):
+    path = str(tmp_path / 'robots.sqlite')
+    fetched = []
+
+    def fetch(url):
+        fetched.append(url)
+        return 200, ROBOTS_TXT
+
+    first = RobotsCache(fetch, path=path)
+    assert not first.allowed('http://a.test/private')
+    first.close()
+
+    second = RobotsCache(fetch, path=path)
+    assert not second.allowed('http://a.test/private')
+    second.close()
+    assert len(fetched) == 1
+
+    expired = RobotsCache(fetch, path=path, ttl=0)
+    expired.allowed('http://a.test/')
+    expired.close()
+    assert len(fetched) == 2
@@ -0,0 +1,80 @@
+import pytest
+
+from crawler_core import default_schema
+from indexer import BatchIndexer
+from search_service import LRUCache, SearchService
+from test_indexer import page
+
+
+def build_index(index_dir, pages, store_content=True):
+    indexer = BatchIndexer(index_dir, default_schema(store_content))
+    for url, content in pages:
+        indexer.add_document(**page(url, content))
+    indexer.close()
+
+
+@pytest.fixture
+def index_dir(tmp_path):
+    return str(tmp_path / 'index')
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c'), len(cache)) == (1, 3, 2)
+
+
+def test_repeated_search_is_cached_until_index_changes(index_dir):
+    build_index(index_dir, [('http://a.test/1', 'kucing hitam'), ('http://a.test/2', 'anjing')])
+    service = SearchService(index_dir, default_schema())
+
+    first = service.search_page('kucing')
+    assert (first.total, first.cached) == (1, False)
+    assert service.search_page('kucing').cached
+    assert service.parse('kucing') is service.parse('kucing')
+
+    # Commit baru dari indexer lain: searcher di-refresh dan cache hasil dikosongkan
+    build_index(index_dir, [('http://a.test/3', 'kucing putih')])
+    refreshed = service.search_page('kucing')
+    assert (refreshed.total, refreshed.cached) == (2, False)
+    service.close()
+
+
+def test_search_pages_through_results(index_dir):
+    build_index(index_dir, [(f'http://a.test/{i}', f'kata nomor {i}') for i in range(25)])
+    service = SearchService(index_dir, default_schema())
+
+    pages = [service.search_page('kata', pagenum, pagelen=10) for pagenum in (1, 2, 3)]
+    assert [len(result.hits) for result in pages] == [10, 10, 5]
+    assert {result.total for result in pages} == {25} and pages[0].pagecount == 3
+    urls = [hit['url'] for result in pages for hit in result.hits]
+    assert len(set(urls)) == 25
+    # Teks lengkap tidak disimpan di hasil, hanya dipakai untuk highlight
+    assert 'content' not in pages[0].hits[0]
+    service.close()
+
+
+def test_title_match_outranks_content_match(index_dir):
+    # page() memakai bagian akhir URL sebagai title
+    build_index(index_dir, [('http://a.test/lain', 'artikel tentang kopi'), ('http://a.test/kopi', 'artikel')])
+    service = SearchService(index_dir, default_schema())
+    hits = service.search_page('kopi').hits
+    assert [hit['url'] for hit in hits] == ['http://a.test/kopi', 'http://a.test/lain']
+    service.close()
+
+
+@pytest.mark.parametrize('store_content', [True, False])
+def test_highlight_reads_content_lazily(index_dir, store_content):
+    build_index(index_dir, [('http://a.test/1', 'teh manis dan kopi pahit')], store_content)
+    schema = default_schema(store_content)
+    service = SearchService(index_dir, schema)
+
+    hit, = service.search_page('kopi').hits
+    fragment = service.highlight('kopi', hit)
+    assert '<strong class="match term0">kopi</strong>' in fragment
+    assert service.highlight('kopi', hit) == fragment
+    service.close()
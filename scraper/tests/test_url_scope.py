@@ -0,0 +1,41 @@
+import pytest
+
+from url_scope import ScopeFilter, bare_host
+
+
+def test_bare_host_strips_www():
+    assert bare_host('https://WWW.Example.com/x') == 'example.com'
+
+
+@pytest.mark.parametrize('scope, url, allowed', [
+    ('host', 'https://example.com/a', True),
+    ('host', 'https://www.example.com/a', True),
+    ('host', 'https://blog.example.com/a', False),
+    ('domain', 'https://blog.example.com/a', True),
+    ('domain', 'https://notexample.com/a', False),
+    ('all', 'https://other.test/a', True),
+])
+def test_scope_hosts(scope, url, allowed):
+    assert ScopeFilter('https://www.example.com/', scope=scope).allows(url) is allowed
+
+
+def test_blocked_extensions_and_rejected_count():
+    scope = ScopeFilter('https://example.com/', blocked_extensions=('PDF', '.zip'))
+    assert not scope.allows('https://example.com/file.pdf')
+    assert not scope.allows('https://example.com/a.ZIP')
+    assert scope.allows('https://example.com/page.html?download=x.pdf')
+    assert scope.rejected == 2
+
+
+def test_include_and_exclude_patterns():
+    scope = ScopeFilter('https://example.com/', include=[r'/blog/'], exclude=[r'\?page=\d+'])
+    assert scope.allows('https://example.com/blog/post')
+    assert not scope.allows('https://example.com/shop/item')
+    assert not scope.allows('https://example.com/blog/?page=2')
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        ScopeFilter('https://example.com/', scope='world')
+    with pytest.raises(ValueError):
+        ScopeFilter('https://example.com/', include=['('])
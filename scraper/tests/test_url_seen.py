@@ -0,0 +1,113 @@
+import math
+
+import pytest
+
+import url_seen
+from url_seen import BloomFilter, FingerprintMap, FingerprintSet, create_seen_set
+
+
+def test_fingerprint_set_add_and_contains():
+    seen = FingerprintSet()
+    assert seen.add('http://example.com/')
+    assert not seen.add('http://example.com/')
+    assert 'http://example.com/' in seen
+    assert 'http://example.com/other' not in seen
+    assert len(seen) == 1
+
+
+def test_fingerprint_set_grows_and_keeps_members():
+    seen = FingerprintSet(capacity=16)
+    size = seen.nbytes
+    urls = [f'http://example.com/{i}' for i in range(1000)]
+    for url in urls:
+        assert seen.add(url)
+    assert seen.nbytes > size
+    assert len(seen) == 1000
+    assert all(url in seen for url in urls)
+
+
+def test_fingerprint_set_probes_past_colliding_slots(monkeypatch):
+    seen = FingerprintSet(capacity=8)
+    size = seen._mask + 1
+    # Tiga fingerprint berbeda yang jatuh di slot awal yang sama
+    fingerprints = {'a': 5, 'b': 5 + size, 'c': 5 + 2 * size, 'd': 6}
+    monkeypatch.setattr(url_seen, 'url_fingerprint', fingerprints.__getitem__)
+
+    assert seen.add('a') and seen.add('b') and seen.add('c')
+    assert 'a' in seen and 'b' in seen and 'c' in seen
+    assert 'd' not in seen
+    assert not seen.add('b')
+
+
+def test_fingerprint_set_state_round_trip():
+    seen = FingerprintSet()
+    for i in range(3000):
+        seen.add(f'http://example.com/{i}')
+
+    restored = FingerprintSet()
+    restored.load_state(seen.to_state())
+    assert len(restored) == 3000
+    assert 'http://example.com/2999' in restored
+    assert 'http://example.com/3000' not in restored
+    assert restored.add('http://example.com/3000')
+
+
+def test_fingerprint_set_copy_is_independent():
+    seen = FingerprintSet()
+    seen.add('http://example.com/a')
+    clone = seen.copy()
+    clone.add('http://example.com/b')
+    assert 'http://example.com/b' not in seen
+    assert 'http://example.com/a' in clone
+
+
+def test_fingerprint_map_put_get_discard():
+    mapping = FingerprintMap(capacity=16)
+    for i in range(500):
+        mapping.put(f'http://example.com/{i}', i + 1)
+    assert len(mapping) == 500
+    assert mapping.get('http://example.com/499') == 500
+    assert mapping.get('http://example.com/500') is None
+
+    mapping.discard('http://example.com/0')
+    assert mapping.get('http://example.com/0') is None
+    assert len(mapping) == 499
+    with pytest.raises(ValueError):
+        mapping.put('http://example.com/x', 0)
+
+
+@pytest.mark.parametrize('capacity, error_rate', [(1000, 0.01), (100_000, 0.001)])
+def test_bloom_filter_sizing(capacity, error_rate):
+    bloom = BloomFilter(capacity, error_rate)
+    # ~9.6 bit per elemen untuk 1%, ~14.4 bit untuk 0.1%
+    bits_per_item = bloom.num_bits / capacity
+    assert bits_per_item == pytest.approx(1.44 * math.log2(1 / error_rate), rel=0.01)
+    assert bloom.nbytes == (bloom.num_bits + 7) // 8
+    assert bloom.num_hashes == round(bits_per_item * 0.693)
+
+
+def test_bloom_filter_false_positive_rate():
+    bloom = BloomFilter(5000, 0.01)
+    for i in range(5000):
+        bloom.add(f'http://example.com/{i}')
+    assert all(f'http://example.com/{i}' in bloom for i in range(5000))
+    false_positives = sum(f'http://other.test/{i}' in bloom for i in range(20000))
+    assert false_positives / 20000 < 0.02
+
+
+def test_bloom_filter_state_requires_same_size():
+    bloom = BloomFilter(1000, 0.01)
+    bloom.add('http://example.com/')
+    state = bloom.to_state()
+
+    restored = BloomFilter(1000, 0.01)
+    restored.load_state(state)
+    assert 'http://example.com/' in restored and len(restored) == 1
+    with pytest.raises(ValueError):
+        BloomFilter(2000, 0.01).load_state(state)
+
+
+def test_create_seen_set_rejects_unknown_kind():
+    assert isinstance(create_seen_set('bloom', capacity=100), BloomFilter)
+    with pytest.raises(ValueError):
+        create_seen_set('set')
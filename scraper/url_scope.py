@@ -0,0 +1,76 @@
+"""Batas cakupan crawl: domain, regex URL dan ekstensi, dicek sebelum URL masuk frontier"""
+import re
+import threading
+from urllib.parse import urlsplit
+
+# host: hanya host URL awal, domain: host URL awal dan subdomainnya, all: semua host
+SCOPES = ('host', 'domain', 'all')
+
+# File yang hampir pasti bukan HTML, dilewati tanpa request sama sekali
+BLOCKED_EXTENSIONS = (
+    '.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx', '.odt', '.csv', '.rtf',
+    '.zip', '.rar', '.7z', '.gz', '.tgz', '.tar', '.bz2', '.xz', '.exe', '.msi', '.dmg', '.iso', '.apk', '.bin',
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.ico', '.bmp', '.tif', '.tiff',
+    '.mp3', '.wav', '.ogg', '.flac', '.mp4', '.m4v', '.avi', '.mov', '.wmv', '.mkv', '.webm',
+    '.css', '.js', '.json', '.xml', '.rss', '.woff', '.woff2', '.ttf', '.otf', '.eot'
+)
+
+
+def bare_host(url):
+    """Hostname tanpa awalan www., untuk membandingkan host"""
+    host = (urlsplit(url).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def _compile_patterns(patterns, label):
+    compiled = []
+    for pattern in patterns:
+        try:
+            compiled.append(re.compile(pattern))
+        except re.error as e:
+            raise ValueError(f"Regex {label} tidak valid '{pattern}': {e}")
+    return compiled
+
+
+class ScopeFilter:
+    """Aturan cakupan crawl yang dikompilasi sekali per crawl
+
+    URL diterima jika host-nya sesuai scope, path-nya tidak berakhiran
+    ekstensi di blocked_extensions, cocok dengan minimal satu pola include
+    (jika ada) dan tidak cocok dengan pola exclude mana pun. Pola regex
+    dicari (re.search) di URL lengkap.
+    """
+
+    def __init__(self, start_url, scope='domain', include=(), exclude=(), blocked_extensions=BLOCKED_EXTENSIONS):
+        if scope not in SCOPES:
+            raise ValueError(f"Cakupan crawl harus salah satu dari {SCOPES}")
+        self.scope = scope
+        self.host = bare_host(start_url)
+        self.include = _compile_patterns(include, "include")
+        self.exclude = _compile_patterns(exclude, "exclude")
+        self.blocked_extensions = tuple(
+            ext.lower() if ext.startswith('.') else f'.{ext.lower()}' for ext in blocked_extensions
+        )
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def _host_allowed(self, url):
+        if self.scope == 'all':
+            return True
+        host = bare_host(url)
+        if self.scope == 'host':
+            return host == self.host
+        return host == self.host or host.endswith('.' + self.host)
+
+    def allows(self, url):
+        """True jika url termasuk cakupan crawl"""
+        allowed = (
+            self._host_allowed(url) and
+            not (self.blocked_extensions and urlsplit(url).path.lower().endswith(self.blocked_extensions)) and
+            (not self.include or any(pattern.search(url) for pattern in self.include)) and
+            not any(pattern.search(url) for pattern in self.exclude)
+        )
+        if not allowed:
+            with self._lock:
+                self.rejected += 1
+        return allowed
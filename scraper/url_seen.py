@@ -0,0 +1,257 @@
+"""Seen-set URL hemat memori untuk crawl berukuran jutaan URL
+
+Set Python berisi string URL menghabiskan ~150 byte per URL. Di sini setiap
+URL ternormalisasi disimpan sebagai fingerprint 64-bit (blake2b) di array
+open addressing, atau sebagai bit di Bloom filter.
+"""
+import base64
+import hashlib
+import math
+import zlib
+from array import array
+
+SEEN_SET_KINDS = ('exact', 'bloom')
+
+# Array digandakan jika terisi lebih dari ini; 8 byte per slot
+_MAX_LOAD = 0.7
+
+
+def url_fingerprint(key):
+    """Fingerprint 64-bit dari URL ternormalisasi, tidak pernah 0 (0 = slot kosong)"""
+    fingerprint = int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little')
+    return fingerprint or 1
+
+
+class FingerprintSet:
+    """Set fingerprint 64-bit di array('Q') dengan linear probing
+
+    Peluang dua URL berbeda bertabrakan sekitar n^2 / 2^65 (kurang dari satu
+    per sejuta untuk 10 juta URL). Memori 8 byte per slot dengan load 0.35-0.7,
+    yaitu sekitar 11-23 byte per URL.
+    """
+
+    def __init__(self, capacity=1024):
+        size = 1 << max(4, math.ceil(math.log2(capacity / _MAX_LOAD)))
+        self._slots = array('Q', bytes(8 * size))
+        self._mask = size - 1
+        self._count = 0
+
+    def add(self, key):
+        """Tambah URL ternormalisasi, return False jika sudah ada"""
+        return self._insert(url_fingerprint(key))
+
+    def __contains__(self, key):
+        fingerprint = url_fingerprint(key)
+        slots, mask = self._slots, self._mask
+        index = fingerprint & mask
+        while True:
+            slot = slots[index]
+            if slot == fingerprint:
+                return True
+            if slot == 0:
+                return False
+            index = (index + 1) & mask
+
+    def _insert(self, fingerprint):
+        slots, mask = self._slots, self._mask
+        index = fingerprint & mask
+        while True:
+            slot = slots[index]
+            if slot == fingerprint:
+                return False
+            if slot == 0:
+                break
+            index = (index + 1) & mask
+
+        slots[index] = fingerprint
+        self._count += 1
+        if self._count > _MAX_LOAD * len(slots):
+            self._grow()
+        return True
+
+    def _grow(self):
+        old = self._slots
+        self._slots = array('Q', bytes(16 * len(old)))
+        self._mask = len(self._slots) - 1
+        self._count = 0
+        for fingerprint in old:
+            if fingerprint:
+                self._insert(fingerprint)
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def nbytes(self):
+        return len(self._slots) * self._slots.itemsize
+
+    def copy(self):
+        """Salinan independen; hanya menyalin array (memcpy), cepat walaupun berisi jutaan URL"""
+        clone = FingerprintSet.__new__(FingerprintSet)
+        clone._slots = self._slots[:]
+        clone._mask = self._mask
+        clone._count = self._count
+        return clone
+
+    def to_state(self):
+        """State ringkas untuk checkpoint: array slot dikompres, slot kosong hampir tidak memakan tempat"""
+        data = zlib.compress(self._slots.tobytes(), 1)
+        return {'kind': 'exact', 'count': self._count, 'data': base64.b64encode(data).decode('ascii')}
+
+    def load_state(self, state):
+        """Ganti isi set dengan state dari to_state()"""
+        slots = array('Q')
+        slots.frombytes(zlib.decompress(base64.b64decode(state['data'])))
+        self._slots = slots
+        self._mask = len(slots) - 1
+        self._count = state['count']
+
+
+class FingerprintMap:
+    """Peta URL -> nilai 64-bit bukan nol di dua array('Q') dengan linear probing
+
+    Dipakai BatchIndexer untuk fingerprint dokumen per URL: 16 byte per slot,
+    sekitar 23-46 byte per URL, alih-alih dict berisi string URL dan hash.
+    discard() hanya mengosongkan nilai; slot kuncinya tetap terpakai.
+    """
+
+    def __init__(self, capacity=1024):
+        size = 1 << max(4, math.ceil(math.log2(capacity / _MAX_LOAD)))
+        self._keys = array('Q', bytes(8 * size))
+        self._values = array('Q', bytes(8 * size))
+        self._mask = size - 1
+        self._used = 0  # slot kunci terpakai, termasuk yang nilainya sudah di-discard
+        self._count = 0
+
+    def _slot(self, fingerprint):
+        keys, mask = self._keys, self._mask
+        index = fingerprint & mask
+        while keys[index] and keys[index] != fingerprint:
+            index = (index + 1) & mask
+        return index
+
+    def get(self, key):
+        """Nilai untuk URL key, atau None"""
+        index = self._slot(url_fingerprint(key))
+        return self._values[index] or None
+
+    def put(self, key, value):
+        if not value:
+            raise ValueError("Nilai FingerprintMap tidak boleh 0")
+        self._put(url_fingerprint(key), value)
+
+    def _put(self, fingerprint, value):
+        index = self._slot(fingerprint)
+        if not self._keys[index]:
+            self._keys[index] = fingerprint
+            self._used += 1
+        if not self._values[index]:
+            self._count += 1
+        self._values[index] = value
+        if self._used > _MAX_LOAD * len(self._keys):
+            self._grow()
+
+    def discard(self, key):
+        index = self._slot(url_fingerprint(key))
+        if self._values[index]:
+            self._values[index] = 0
+            self._count -= 1
+
+    def _grow(self):
+        keys, values = self._keys, self._values
+        size = len(keys) * 2
+        self._keys = array('Q', bytes(8 * size))
+        self._values = array('Q', bytes(8 * size))
+        self._mask = size - 1
+        self._used = self._count = 0
+        for fingerprint, value in zip(keys, values):
+            if value:
+                self._put(fingerprint, value)
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def nbytes(self):
+        return (len(self._keys) + len(self._values)) * self._keys.itemsize
+
+
+class BloomFilter:
+    """Bloom filter dengan ukuran tetap untuk capacity URL dan peluang false positive error_rate
+
+    URL yang dianggap sudah dilihat padahal belum (false positive) akan
+    terlewat, tidak pernah sebaliknya. Untuk 0.1% dibutuhkan ~1.8 byte per URL.
+    """
+
+    def __init__(self, capacity=10_000_000, error_rate=0.001):
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate harus di antara 0 dan 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._count = 0
+
+    def _positions(self, key):
+        # Double hashing: k posisi dari dua hash 64-bit
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key):
+        """Tambah URL ternormalisasi, return False jika (kemungkinan besar) sudah ada"""
+        bits = self._bits
+        added = False
+        for position in self._positions(key):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                added = True
+        if added:
+            self._count += 1
+        return added
+
+    def __contains__(self, key):
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def nbytes(self):
+        return len(self._bits)
+
+    def copy(self):
+        clone = BloomFilter.__new__(BloomFilter)
+        clone.__dict__.update(self.__dict__)
+        clone._bits = self._bits[:]
+        return clone
+
+    def to_state(self):
+        return {'kind': 'bloom', 'capacity': self.capacity, 'error_rate': self.error_rate,
+                'count': self._count, 'data': base64.b64encode(bytes(self._bits)).decode('ascii')}
+
+    def load_state(self, state):
+        if (state['capacity'], state['error_rate']) != (self.capacity, self.error_rate):
+            raise ValueError("Ukuran Bloom filter di checkpoint berbeda dengan pengaturan crawl")
+        self._bits = bytearray(base64.b64decode(state['data']))
+        self._count = state['count']
+
+
+def create_seen_set(kind='exact', capacity=10_000_000, error_rate=0.001):
+    """Buat seen-set sesuai SEEN_SET_KINDS; capacity hanya menentukan ukuran Bloom filter"""
+    if kind == 'exact':
+        return FingerprintSet()
+    if kind == 'bloom':
+        return BloomFilter(capacity, error_rate)
+    raise ValueError(f"Seen-set harus salah satu dari {SEEN_SET_KINDS}")
+
+
+def describe_memory(seen):
+    """Ringkasan memori seen-set untuk log crawl"""
+    count = len(seen)
+    per_url = seen.nbytes / count if count else 0
+    return f"{count} URL, {seen.nbytes / 1024 / 1024:.1f} MB ({per_url:.1f} byte/URL)"